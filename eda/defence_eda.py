@@ -32,7 +32,7 @@ engine = create_engine(f"postgresql+psycopg2://{PG_USER}:{PG_PASSWORD}@{PG_HOST}
 # Load defence data
 query = """
 SELECT date, indicator, value, insight, file_source
-FROM unified_macro_view
+FROM unified_macro_fact
 WHERE domain = 'defence'
 ORDER BY date
 """
@@ -0,0 +1,32 @@
+-- One-off migration: processed tables loaded before the typed upload kept
+-- "date" as TEXT. upload_postgres.py now creates it as TIMESTAMP, but it
+-- cannot retype a column that unified_macro_view / unified_macro_fact
+-- depend on, so it keeps loading into the old TEXT column until this runs.
+--
+-- Drops both views, converts every TEXT "date" column of the *_processed
+-- tables in place, and recreates the views, all in one transaction:
+--   psql -d macrodb -f migrate_date_timestamp.sql
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS unified_macro_fact;
+DROP VIEW IF EXISTS unified_macro_view;
+
+DO $$
+DECLARE
+  t record;
+BEGIN
+  FOR t IN
+    SELECT table_name FROM information_schema.columns
+    WHERE table_schema = current_schema() AND column_name = 'date' AND data_type = 'text'
+      AND table_name LIKE '%\_processed'
+  LOOP
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN date TYPE timestamp USING date::timestamp', t.table_name);
+    RAISE NOTICE 'converted %.date to timestamp', t.table_name;
+  END LOOP;
+END
+$$;
+
+\ir unified_view.sql
+\ir unified_fact.sql
+
+COMMIT;
@@ -1,9 +1,12 @@
-import requests
+import asyncio
+import json
+import aiohttp
 import pandas as pd
-import time
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from src.utils import http_cache, landing
+from src.utils.ratelimit import TokenBucket
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")    
@@ -11,10 +14,15 @@ data_dir = os.getenv("DATA_DIR")
 # Parameters
 api_key = os.getenv('CROP_API_KEY')
 base_url = 'https://api.fas.usda.gov/api/psd/commodity'
+commodities_url = 'https://api.fas.usda.gov/api/psd/commodities'
 start_year = 2000
 end_year = int(datetime.now().year)
 
-# Commodities
+# Request pacing: shared rate limit and bounded in-flight requests
+RATE_PER_SEC = 5
+MAX_CONCURRENCY = 8
+
+# Commodities (override with PSD_COMMODITIES: "all" or a JSON file of {commodityCode, commodityName})
 commodity_code = [
     {'commodityCode': '0410000', 'commodityName': 'Wheat'},
     {'commodityCode': '0440000', 'commodityName': 'Corn'},
@@ -30,25 +38,47 @@ headers = {
 }
 
 # Function
+def load_commodities(default):
+    source = os.getenv('PSD_COMMODITIES')
+    if not source:
+        return default
+    if source == 'all':
+        response = http_cache.get(commodities_url, headers=headers)
+        response.raise_for_status()
+        return [{'commodityCode': c['commodityCode'], 'commodityName': c['commodityName']} for c in response.json()]
+    with open(source, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+async def fetch_year(session, limiter, semaphore, code, name, year):
+    url = f"{base_url}/{code}/world/year/{year}"
+    # Retries, backoff and circuit breaking happen in the shared request layer
+    async with semaphore:
+        response = await http_cache.aget(session, url, headers=headers, limiter=limiter)
+
+    response.raise_for_status()
+    rows = response.json()
+    for row in rows:
+        row["commodityCode"] = code
+        row["commodityName"] = name
+    return rows
+
+async def fetch_all_years(commodity_code, start_year, end_year):
+    limiter = TokenBucket(RATE_PER_SEC)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as session:
+        results = await asyncio.gather(*(
+            fetch_year(session, limiter, semaphore, item["commodityCode"], item["commodityName"], year)
+            for item in commodity_code
+            for year in range(start_year, end_year + 1)
+        ))
+    return [row for rows in results for row in rows]
+
 def fetch_commodity_data(commodity_code, start_year, end_year):
-    all_data = []
-    for item in commodity_code:
-        code = item["commodityCode"]
-        name = item["commodityName"]
-        for year in range(start_year, end_year + 1):
-            url = f"{base_url}/{code}/world/year/{year}"
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            rows = response.json()
-            for row in rows:
-                row["commodityCode"] = code
-                row["commodityName"] = name
-                all_data.append(row)
-            time.sleep(0.3)
-    return all_data
+    return asyncio.run(fetch_all_years(commodity_code, start_year, end_year))
 
 # Run & Display
-data = fetch_commodity_data(commodity_code, start_year, end_year)
+data = fetch_commodity_data(load_commodities(commodity_code), start_year, end_year)
 df = pd.DataFrame(data)
 
 attribute_id = 28  # Production only
@@ -66,5 +96,5 @@ print(df.head())
 
 save_path = os.path.join(data_dir, "agriculture", "crop_production.csv")
 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
+landing.write_raw(df, save_path)
 print("Data saved to crop_production.csv")
@@ -0,0 +1,219 @@
+"""Collector registry and runner.
+
+Every collector script still does its work at import time, so each task runs
+as ``python -m <module>`` in its own subprocess. That gives us a hard timeout
+per task and lets independent sources run in parallel on a thread pool.
+
+    python -m src.collect --all
+    python -m src.collect --only energy trade.bdi --jobs 6
+    python -m src.collect --all --replay
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from dotenv import load_dotenv
+from src.utils.downloads import UNCHANGED_EXIT_CODE
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(DATA_DIR or ".", ".state", "logs", "collect")
+# Outcome of each task's last real run, so a dependent is only skipped when its output is current
+STATUS_PATH = os.path.join(DATA_DIR or ".", ".state", "collect_status.json")
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    name: str
+    module: str
+    sector: str
+    deps: list = field(default_factory=list)
+    timeout: int = 600  # seconds
+    retries: int = 2
+
+
+@dataclass
+class Result:
+    status: str  # ok | unchanged | failed | timeout | skipped
+    attempts: int = 0
+    seconds: float = 0.0
+    detail: str = ""
+
+
+# Collector registry
+TASKS = [
+    Task("agriculture.crop", "src.agriculture.crop", "agriculture"),
+    Task("defence.bid_info", "src.defence.BidInfo", "defence"),
+    Task("economy.fx_rates", "src.economy.FXrate", "economy"),
+    Task("economy.confidence", "src.economy.confidence", "economy"),
+    Task("economy.cycle", "src.economy.cycle", "economy"),
+    Task("energy.global_energy", "src.energy.globalengergydata", "energy", timeout=3600, retries=1),
+    Task("energy.momr", "src.energy.monthlyreport", "energy", timeout=300),
+    Task("energy.opec_insight", "src.processed.opec_insight_extractor", "energy", deps=["energy.momr"], retries=0),
+    Task("energy.oil_stocks", "src.energy.oilstocks", "energy"),
+    Task("energy.petronet", "src.energy.petronet", "energy"),
+    Task("energy.petronet_summary", "src.energy.petronetsummary", "energy", deps=["energy.petronet"], retries=0),
+    Task("industry.manufacture", "src.industry.manufacture", "industry"),
+    Task("industry.steel", "src.industry.steel", "industry", timeout=300),
+    Task("trade.bdi", "src.trade.BDI", "trade"),
+    Task("trade.kotra", "src.trade.kotra", "trade"),
+    Task("trade.kotra_korea_export", "src.trade.kotra_korea_export", "trade"),
+    Task("trade.semiconductor", "src.trade.semiconductor", "trade", timeout=300),
+    Task("trade.ecos_trade", "src.trade.trade", "trade"),
+    Task("trade.ecos_trade_items", "src.trade.tradeitems", "trade"),
+]
+REGISTRY = {task.name: task for task in TASKS}
+
+
+def select_tasks(only):
+    """Resolve ``--only`` selectors (sector names or task names) to registry tasks."""
+    if not only:
+        return list(TASKS)
+    unknown = [s for s in only if s not in REGISTRY and not any(t.sector == s for t in TASKS)]
+    if unknown:
+        raise SystemExit(f"Unknown sector or task: {', '.join(unknown)}")
+    return [t for t in TASKS if t.name in only or t.sector in only]
+
+
+def run_task(task, env):
+    """Run one collector in a subprocess, retrying on failure or timeout."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{task.name}.log")
+    started = time.perf_counter()
+    result = Result("failed")
+
+    for attempt in range(1, task.retries + 2):
+        result.attempts = attempt
+        with open(log_path, "w", encoding="utf-8") as log:
+            try:
+                proc = subprocess.run(
+                    [sys.executable, "-m", task.module],
+                    cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT, timeout=task.timeout,
+                )
+                if proc.returncode == 0:
+                    result.status, result.detail = "ok", ""
+                    break
+                if proc.returncode == UNCHANGED_EXIT_CODE:
+                    result.status, result.detail = "unchanged", "source identical to previous download"
+                    break
+                result.status, result.detail = "failed", f"exit code {proc.returncode}"
+            except subprocess.TimeoutExpired:
+                result.status, result.detail = "timeout", f"exceeded {task.timeout}s"
+
+        logger.warning(f"{task.name} attempt {attempt} {result.status}: {result.detail} (log: {log_path})")
+        if attempt <= task.retries:
+            time.sleep(2 ** attempt)
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def load_status(path=STATUS_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_status(results, path=STATUS_PATH):
+    """Merge ``{name: Result}`` into the stored last-run outcomes."""
+    status = load_status(path)
+    for name, result in results.items():
+        status[name] = {"status": result.status, "at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def run(tasks, jobs=4, env=None):
+    """Execute ``tasks`` respecting dependencies; returns ``{name: Result}``.
+
+    A dependent is marked unchanged without running only when every
+    dependency finished unchanged and its own last run succeeded; a task that
+    failed last time runs again even if nothing new arrived upstream.
+    """
+    env = env or os.environ.copy()
+    last = load_status()
+    reused = set()  # dependents left as they were; their stored outcome stays as is
+    selected = {t.name for t in tasks}
+    deps = {t.name: [d for d in t.deps if d in selected] for t in tasks}
+    pending = {t.name: t for t in tasks}
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                states = [results[d].status if d in results else None for d in deps[name]]
+                if None in states:
+                    continue
+                if any(s not in ("ok", "unchanged") for s in states):
+                    failed = [d for d in deps[name] if results[d].status not in ("ok", "unchanged")]
+                    results[name] = Result("skipped", detail=f"dependency {', '.join(failed)} did not succeed")
+                    del pending[name]
+                elif (states and all(s == "unchanged" for s in states)
+                      and last.get(name, {}).get("status") in ("ok", "unchanged")):
+                    # Nothing new upstream and the previous output is current, so there is nothing to rebuild
+                    results[name] = Result("unchanged", detail=f"dependencies unchanged: {', '.join(deps[name])}")
+                    reused.add(name)
+                    del pending[name]
+                else:
+                    logger.info(f"Starting {name}")
+                    running[pool.submit(run_task, pending.pop(name), env)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                logger.info(f"Finished {name}: {results[name].status} in {results[name].seconds:.1f}s")
+
+    save_status({name: r for name, r in results.items() if name not in reused})
+    return results
+
+
+def print_report(results):
+    print("\n=== COLLECTION SUMMARY ===")
+    print(f"{'task':<28} {'status':<10} {'tries':>5} {'secs':>8}  detail")
+    for name in sorted(results):
+        r = results[name]
+        print(f"{name:<28} {r.status:<10} {r.attempts:>5} {r.seconds:>8.1f}  {r.detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run data collectors")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--all", action="store_true", help="run every registered collector")
+    group.add_argument("--only", nargs="+", metavar="SECTOR_OR_TASK", help="run selected sectors or tasks")
+    parser.add_argument("--jobs", type=int, default=4, help="collectors to run in parallel")
+    parser.add_argument("--replay", action="store_true", help="serve HTTP responses from the cache only")
+    args = parser.parse_args()
+
+    env = os.environ.copy()
+    if args.replay:
+        env["HTTP_CACHE_MODE"] = "replay"
+
+    started = time.perf_counter()
+    results = run(select_tasks(args.only), jobs=args.jobs, env=env)
+    print_report(results)
+    print(f"\nTotal wall time: {time.perf_counter() - started:.1f}s")
+
+    if any(r.status not in ("ok", "unchanged") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
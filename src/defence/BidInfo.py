@@ -1,42 +1,78 @@
-import requests
-import pandas as pd
+import io
+import math
+import pyarrow.parquet as pq
 import xml.etree.ElementTree as ET
 import os
 from dotenv import load_dotenv
+from src.utils import http_cache, landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 api_key = os.getenv('BID_API_KEY')
 list_url = 'http://openapi.d2b.go.kr/openapi/service/PrcurePlanInfoService/getDmstcPrcurePlanList'
 
+PAGE_SIZE = 1000
+
 params = {
     'serviceKey': api_key,
     'orderPrearngeMtBegin': '20100101',
-    'numOfRows': '10000',
+    'numOfRows': str(PAGE_SIZE),
 }
 
-response = requests.get(list_url, params=params)
-response.encoding = 'utf-8'
-root = ET.fromstring(response.content)
+# Drop unnecessary columns if desired
+columns_to_drop = ['beffatStndrdOthbcAt', 'bidMth', 'cntrctMth', 'dcsNo', 'orntCode', 'progrsSttusCode', 'spcifyPrcureAt']
 
-items = root.findall('.//item')
-data = []
-for item in items:
-    row = {}
-    for child in item:
-        row[child.tag] = child.text
-    data.append(row)
 
-df = pd.DataFrame(data)
+def iter_items(source, meta):
+    """Stream <item> rows out of one XML page, clearing each element once read.
 
-# Drop unnecessary columns if desired
-columns_to_drop = ['beffatStndrdOthbcAt', 'bidMth', 'cntrctMth', 'dcsNo', 'orntCode', 'progrsSttusCode', 'spcifyPrcureAt']
-df.drop(columns=[col for col in columns_to_drop if col in df.columns], inplace=True)
+    ``meta`` receives the page's ``totalCount``.
+    """
+    for _, elem in ET.iterparse(source, events=('end',)):
+        if elem.tag == 'item':
+            yield {child.tag: child.text for child in elem}
+            elem.clear()
+        elif elem.tag == 'totalCount':
+            meta['totalCount'] = int(elem.text or 0)
+        elif elem.tag == 'resultCode' and elem.text not in ('00', '0000'):
+            raise RuntimeError(f"DAPA API error code {elem.text}")
+
+
+def fetch_page(page_no, meta):
+    response = http_cache.get(list_url, params={**params, 'pageNo': str(page_no)})
+    response.raise_for_status()
+    return iter_items(io.BytesIO(response.content), meta)
+
+
+def page_rows(page_no, meta):
+    """One page as a list of dicts, without the dropped columns; fields may differ between rows."""
+    return [{k: v for k, v in row.items() if k not in columns_to_drop} for row in fetch_page(page_no, meta)]
 
-print(df.head())
 
 save_path = os.path.join(data_dir, "defence", "bid_info.csv")
-os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
-print("Data saved to bid_info.csv")
 
+# Pages are landed one at a time; the column set is the union over every row and page
+writer = landing.PageWriter(save_path)
+try:
+    # Page 1 tells us how many pages the full history spans
+    meta = {'totalCount': 0}
+    writer.write(page_rows(1, meta))
+
+    page_count = math.ceil(meta['totalCount'] / PAGE_SIZE)
+    for page_no in range(2, page_count + 1):
+        writer.write(page_rows(page_no, meta))
+        print(f"Fetched page {page_no}/{page_count}")
+except BaseException:
+    writer.abort()
+    raise
+
+if writer.rows != meta['totalCount']:
+    print(f"Warning: API reported {meta['totalCount']} rows, received {writer.rows}")
+
+if writer.rows == 0:
+    writer.abort()
+    raise SystemExit("No bid rows returned; keeping the existing bid_info landing")
+
+parquet_path = writer.close()
+print(next(pq.ParquetFile(parquet_path).iter_batches(batch_size=5)).to_pandas())
+print(f"Data saved to {parquet_path} ({writer.rows} rows)")
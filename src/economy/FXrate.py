@@ -1,16 +1,16 @@
-import requests
 import pandas as pd
 from datetime import datetime
-import time
 import os
 from dotenv import load_dotenv
+from src.utils.ecos import SeriesQuery, fetch_all
+from src.utils import landing
+from src.utils.watermark import WatermarkStore, merge_into_csv
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
 # Parameters
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 start_date = '200001'
 end_date = datetime.now().strftime('%Y%m')
 stat_code_main = '731Y004'
@@ -29,18 +29,26 @@ currency_codes2 = {
     '0000003': 'USD/EUR'
 }
 
+save_path = os.path.join(data_dir, "economy", "fx_rates.csv")
+
+# Only the trailing window is requested once a raw file exists
+watermarks = WatermarkStore()
+incremental = landing.exists(save_path)
+
 # Functions
-def fetch_fx_data(stat_code, currencies):
+def fetch_fx_data(series):
+    labels = [(stat_code, code, name) for stat_code, currencies in series for code, name in currencies.items()]
+    queries = [
+        SeriesQuery(stat_code, cycle,
+                    watermarks.start_period(stat_code, cycle, start_date, (code,)) if incremental else start_date,
+                    end_date, (code, measurement_code))
+        for stat_code, code, _ in labels
+    ]
+    results = fetch_all(queries, api_key=api_key)
+
     all_data = []
-    for code, name in currencies.items():
-        url = (
-            f"{base_url}/{api_key}/json/kr/1/1000/"
-            f"{stat_code}/{cycle}/{start_date}/{end_date}/"
-            f"{code}/{measurement_code}"
-        )
-        response = requests.get(url)
-        data = response.json()
-        rows = data.get('StatisticSearch', {}).get('row', [])
+    for (stat_code, _, name), rows in zip(labels, results):
+        watermarks.update(stat_code, rows)
         for row in rows:
             row['CURRENCY'] = name
             row['EXCHANGE_RATE'] = float(row['DATA_VALUE'])
@@ -48,9 +56,7 @@ def fetch_fx_data(stat_code, currencies):
     return all_data
 
 # Run
-data_main = fetch_fx_data(stat_code_main, currency_codes)
-data_eur = fetch_fx_data(stat_code_eur, currency_codes2)
-final_data = data_main + data_eur
+final_data = fetch_fx_data([(stat_code_main, currency_codes), (stat_code_eur, currency_codes2)])
 
 # DataFrame
 df = pd.DataFrame(final_data)
@@ -59,6 +65,10 @@ df = df.dropna(subset=['EXCHANGE_RATE', 'DATE'])
 df = df[['DATE', 'CURRENCY', 'EXCHANGE_RATE', 'UNIT_NAME']].sort_values(['CURRENCY', 'DATE'])
 df['UNIT_NAME'] = df['UNIT_NAME'].replace('통화당 달러', '달러')
 
+# Merge the fetched window into the existing history
+df = merge_into_csv(df, save_path, keys=['CURRENCY', 'DATE'], date_cols=['DATE'])
+df = df.sort_values(['CURRENCY', 'DATE'])
+
 # Print Preview
 print(df.head(10))
 for currency in df['CURRENCY'].unique():
@@ -66,7 +76,7 @@ for currency in df['CURRENCY'].unique():
     print(f"{currency}: {latest['EXCHANGE_RATE']:.2f} ({latest['DATE'].strftime('%Y-%m')})")
 
 # Save
-save_path = os.path.join(data_dir, "economy", "fx_rates.csv")
 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
+landing.write_raw(df, save_path)
+watermarks.save()
 print("Data saved to monthly_fx_rates.csv")
@@ -1,33 +1,39 @@
-import requests
 import pandas as pd
 from datetime import datetime
-import time
 import os
 from dotenv import load_dotenv
+from src.utils.ecos import SeriesQuery, fetch_all
+from src.utils import landing
+from src.utils.watermark import WatermarkStore, merge_into_csv
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 # Parameters
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 start_date = '201001'
 end_date = datetime.now().strftime('%Y%m')
 stat_codes = ['513Y001', '521Y001']  # 경제심리지수, 뉴스심리지수
 cycle = 'M'
+save_path = os.path.join(data_dir, "economy", "economy_confidence.csv")
+
+# Only the trailing window is requested once a raw file exists
+watermarks = WatermarkStore()
+incremental = landing.exists(save_path)
 
 # Function
 def fetch_data(stat_codes):
-    all_data = []
-    for code in stat_codes:
-        url = f"{base_url}/{api_key}/json/kr/1/10000/{code}/{cycle}/{start_date}/{end_date}/"
-        response = requests.get(url)
+    queries = [
+        SeriesQuery(code, cycle, watermarks.start_period(code, cycle, start_date) if incremental else start_date, end_date)
+        for code in stat_codes
+    ]
+    results = fetch_all(queries, api_key=api_key)
 
-        data = response.json()
-        rows = data.get('StatisticSearch', {}).get('row', [])
+    all_data = []
+    for code, rows in zip(stat_codes, results):
+        watermarks.update(code, rows)
         for row in rows:
             row['STAT_CODE'] = code
             all_data.append(row)
-        time.sleep(0.3)
     return all_data
 
 # Run
@@ -44,10 +50,14 @@ df['STAT_CODE'] = df['STAT_CODE'].replace({
 cols_to_drop = ['ITEM_CODE2', 'ITEM_NAME2', 'ITEM_CODE3', 'ITEM_NAME3',
                 'ITEM_CODE4', 'ITEM_NAME4', 'UNIT_NAME', 'WGT']
 df.drop(columns=cols_to_drop, inplace=True, errors='ignore')
+
+# Merge the fetched window into the existing history
+df = merge_into_csv(df, save_path, keys=['STAT_CODE', 'ITEM_CODE1', 'TIME'])
+df = df.sort_values(['STAT_CODE', 'ITEM_CODE1', 'TIME'])
 print(df.head)
 
 # Save to CSV
-save_path = os.path.join(data_dir, "economy", "economy_confidence.csv")
 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
+landing.write_raw(df, save_path)
+watermarks.save()
 print("Data saved to economy_confidence.csv")
@@ -1,25 +1,30 @@
-import requests
 import pandas as pd
 from datetime import datetime
 import yfinance as yf
 import os
 from dotenv import load_dotenv
+from src.utils.ecos import SeriesQuery, fetch_all
+from src.utils import landing
+from src.utils.watermark import WatermarkStore, merge_into_csv
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 # Parameters
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 stat_code = '901Y067'
 freq = 'M'
 start_period = '200001'
 end_period = datetime.today().strftime('%Y%m')
+save_path = os.path.join(data_dir, "economy", "leading_vs_coincident_kospi.csv")
+
+# Only the trailing window is requested once a raw file exists
+watermarks = WatermarkStore()
+if landing.exists(save_path):
+    start_period = watermarks.start_period(stat_code, freq, start_period)
 
 # Fetch ECOS data
-url = f"{base_url}/{api_key}/json/kr/1/10000/{stat_code}/{freq}/{start_period}/{end_period}"
-response = requests.get(url)
-data = response.json()
-rows = data.get('StatisticSearch', {}).get('row', [])
+rows = fetch_all([SeriesQuery(stat_code, freq, start_period, end_period)], api_key=api_key)[0]
+watermarks.update(stat_code, rows)
 df = pd.DataFrame(rows)
 
 # Preprocess ECOS data
@@ -47,10 +52,14 @@ pivot_df = pivot_df.merge(kospi_monthly, on='datetime', how='left')
 
 # After the merge line
 pivot_df = pivot_df.rename(columns={'^KS11': 'KOSPI'})
+
+# Merge the fetched window into the existing history
+pivot_df = merge_into_csv(pivot_df, save_path, keys=['datetime'], date_cols=['datetime'])
+pivot_df = pivot_df.sort_values('datetime')
 print(pivot_df.head())
 
 # Save
-save_path = os.path.join(data_dir, "economy", "leading_vs_coincident_kospi.csv")
 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-pivot_df.to_csv(save_path, index=False, encoding='utf-8-sig')
+landing.write_raw(pivot_df, save_path)
+watermarks.save()
 print("Data saved to cycle.csv")
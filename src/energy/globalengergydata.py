@@ -3,16 +3,27 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import threading
 import pandas as pd
 import re, os
 from dotenv import load_dotenv
+from src.utils import landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
+# Point IEA_BASE_URL at a local static server (python -m http.server) to run against fixtures
+BASE_URL = os.getenv("IEA_BASE_URL", "https://www.iea.org")
+WORKERS = 4
+CHECKPOINT_PATH = os.path.join(data_dir, ".state", "iea_country_checkpoint.jsonl")
+
 def initialize_browser():
-    """Initialize a Chrome WebDriver instance with predefined options."""
+    """Initialize a headless Chrome WebDriver instance with predefined options."""
     options = Options()
+    options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
@@ -107,31 +118,20 @@ def scrape_country_data(driver, url):
 
     return country_data
 
-def scrape_continent(driver, continent_url, continent_name):
-    """Scrape data for all countries within a continent."""
+def scrape_continent_links(driver, continent_url):
+    """Collect the country page URLs listed on a continent page."""
     driver.get(continent_url)
 
     country_links = WebDriverWait(driver, 10).until(
         EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@class, 'm-country-listing__link')]"))
     )
-    country_links = [a.get_attribute("href") for a in country_links]
-
-    continent_data = []
-    for country_url in country_links:
-        country_data = scrape_country_data(driver, country_url)
-        continent_data.append(country_data)
+    return [a.get_attribute("href") for a in country_links]
 
-    return continent_data
-
-def main():
-    base_url = "https://www.iea.org"
-    regions_url = f"{base_url}/countries"
+def discover_country_urls(base_url):
+    """Walk the regions page and every continent page, returning country URLs in page order."""
     driver = initialize_browser()
-
-    all_data = []
-
     try:
-        driver.get(regions_url)
+        driver.get(f"{base_url}/countries")
 
         # Extract links and names of continents
         continent_links = WebDriverWait(driver, 10).until(
@@ -141,26 +141,75 @@ def main():
             (a.get_attribute("href"), a.find_element(By.TAG_NAME, "h3").text)
             for a in continent_links
         ]
-
         print(f"Found {len(continent_links)} continents to scrape.")
 
-        # Scrape each continent
+        country_urls = []
         for continent_url, continent_name in continent_links:
-            print(f"Scraping continent: {continent_name}...")
-            continent_data = scrape_continent(driver, continent_url, continent_name)
-            all_data.extend(continent_data)
+            urls = scrape_continent_links(driver, continent_url)
+            print(f"{continent_name}: {len(urls)} countries")
+            country_urls.extend(url for url in urls if url not in country_urls)
+        return country_urls
+    finally:
+        driver.quit()
 
+def load_checkpoint(path):
+    """Return {url: country_data} for every country finished by a previous (crashed) run."""
+    done = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    done[record["url"]] = record["data"]
+    return done
+
+def scrape_shard(urls, checkpoint_path, lock):
+    """Scrape one shard of country URLs on a dedicated browser, checkpointing after each country."""
+    driver = initialize_browser()
+    results = {}
+    try:
+        for url in urls:
+            country_data = scrape_country_data(driver, url)
+            results[url] = country_data
+            with lock, open(checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"url": url, "data": country_data}, ensure_ascii=False) + "\n")
     finally:
         driver.quit()
-        print("Browser closed.")
+    return results
 
-    # Save all data to a CSV file relative to the script
+def main():
+    parser = argparse.ArgumentParser(description="Scrape IEA country energy profiles")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="parallel headless browsers")
+    parser.add_argument("--base-url", default=BASE_URL, help="IEA site root (or a local fixture server)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+    country_urls = discover_country_urls(args.base_url.rstrip("/"))
+    scraped = load_checkpoint(CHECKPOINT_PATH)
+    remaining = [url for url in country_urls if url not in scraped]
+    print(f"{len(country_urls)} countries, {len(scraped)} already checkpointed, {len(remaining)} to scrape.")
+
+    # Round-robin shards so each browser gets a similar mix of continents
+    if remaining:
+        workers = min(args.workers, len(remaining))
+        shards = [remaining[i::workers] for i in range(workers)]
+        lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(lambda shard: scrape_shard(shard, CHECKPOINT_PATH, lock), shards):
+                scraped.update(results)
+        print("Browsers closed.")
+
+    # Save all data in discovery order
     output_file_path = os.path.join(data_dir, "energy", "global_energy_data.csv")
     os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
 
-    df = pd.DataFrame(all_data)
-    df.to_csv(output_file_path, index=False, encoding="utf-8-sig")
+    df = pd.DataFrame([scraped[url] for url in country_urls if url in scraped])
+    landing.write_raw(df, output_file_path)
     print(f"Data saved to {output_file_path}.")
 
+    # A completed crawl starts from scratch next time
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,17 +1,20 @@
 import os
-import time
+import sys
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from dotenv import load_dotenv
+from src.utils import downloads
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
     
 # Set your desired download directory
 DOWNLOAD_DIR = os.path.abspath(os.path.join(data_dir, "energy"))
-os.makedirs(os.path.dirname(DOWNLOAD_DIR), exist_ok=True)
+os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+
+TARGET_FILENAME = "OPEC_MOMR_Latest.pdf"
 
 def download_latest_momr():
     options = uc.ChromeOptions()
@@ -42,13 +45,14 @@ def download_latest_momr():
         accept_btn = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Accept OPEC Data Policy Disclaimer')]"))
         )
+        before = downloads.snapshot(DOWNLOAD_DIR)
         accept_btn.click()
         print("Accepted data policy.")
 
-        # Step 4: Wait for download to start (or finish)
-        time.sleep(10)  # increase if download is slow
-        print(f"Download initiated to: {DOWNLOAD_DIR}")
-
+        # Step 4: Wait until the browser has finalised the PDF
+        downloaded = downloads.wait_for_download(DOWNLOAD_DIR, before, ".pdf")
+        print(f"Downloaded: {downloaded}")
+        return downloaded
 
     finally:
         driver.quit()
@@ -56,16 +60,11 @@ def download_latest_momr():
         print("Browser closed.")
 
 if __name__ == "__main__":
-    download_latest_momr()
-        
-    # Find the newest PDF file in the download directory
-    downloaded_files = [f for f in os.listdir(DOWNLOAD_DIR) if f.endswith('.pdf')]
-    downloaded_files.sort(key=lambda f: os.path.getmtime(os.path.join(DOWNLOAD_DIR, f)), reverse=True)
+    downloaded = download_latest_momr()
+    renamed_path = os.path.join(DOWNLOAD_DIR, TARGET_FILENAME)
 
-    if downloaded_files:
-        original_path = os.path.join(DOWNLOAD_DIR, downloaded_files[0])
-        renamed_path = os.path.join(DOWNLOAD_DIR, 'OPEC_MOMR_Latest.pdf')
-        os.rename(original_path, renamed_path)
+    if downloads.replace_if_changed(downloaded, renamed_path):
         print(f"Renamed downloaded file to: {renamed_path}")
     else:
-        print("No PDF found to rename.")
+        print(f"MOMR unchanged; keeping existing {TARGET_FILENAME}")
+        sys.exit(downloads.UNCHANGED_EXIT_CODE)
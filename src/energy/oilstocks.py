@@ -1,49 +1,122 @@
-import requests
+import argparse
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+
 import pandas as pd
 from dotenv import load_dotenv
-import os
+from src.utils import http_cache, landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
-year = "2025"  # Change this as needed
-all_data = []
-
-for month in range(1, 13):
-    month_str = f"{month:02d}"
-    url = f"https://api.iea.org/netimports/monthly?year={year}&month={month_str}"
-    headers = {
-        "Accept": "application/json",
-        "User-Agent": "Mozilla/5.0",
-        "Referer": "https://www.iea.org/data-and-statistics/data-tools/oil-stocks-of-iea-countries",
-        "Origin": "https://www.iea.org"
-    }
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        data = response.json()
-        if not data:
-            print(f"No data for {year}-{month_str}")
-            continue
-        for row in data:
-            row["Year"] = year
-            row["Month"] = month_str
-            all_data.append(row)
-    else:
-        print(f"Failed to fetch {year}-{month_str}: Status {response.status_code}")
-
-# Convert to DataFrame
-df = pd.DataFrame(all_data)
-
-
-# Reorder columns
-desired_order = ['Year', 'Month', 'countryName', 'total', 'industry', 'publicData', 'abroadIndustry', 'abroadPublic']
-df = df[desired_order]
-
-df["Month"] = pd.to_datetime(df["Year"] + "-" + df["Month"] + "-01").dt.strftime("%B")
-
-# Save or show
-save_path = os.path.join(data_dir, "energy", "iea_oil_stocks.csv")
-os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
-print("Data saved to iea_oil_stocks.csv")
\ No newline at end of file
+# Parameters
+URL = "https://api.iea.org/netimports/monthly"
+HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "Mozilla/5.0",
+    "Referer": "https://www.iea.org/data-and-statistics/data-tools/oil-stocks-of-iea-countries",
+    "Origin": "https://www.iea.org"
+}
+WORKERS = 6
+# Latest stored months refetched on every run so IEA revisions are picked up
+REVISION_MONTHS = 3
+COLUMNS = ['Year', 'Month', 'countryName', 'total', 'industry', 'publicData', 'abroadIndustry', 'abroadPublic']
+
+PARTITION_DIR = os.path.join(data_dir, "energy", "iea_oil_stocks")
+SAVE_PATH = os.path.join(data_dir, "energy", "iea_oil_stocks.csv")
+
+
+# Function
+def month_range(start_ym, end_ym):
+    """All (year, month) pairs from ``start_ym`` to ``end_ym`` inclusive, both given as 'YYYY-MM'."""
+    return [(p.year, p.month) for p in pd.period_range(start_ym, end_ym, freq="M")]
+
+
+def partition_path(year, month):
+    return os.path.join(PARTITION_DIR, f"year={year}", f"month={month:02d}.csv")
+
+
+def fetch_month(year, month):
+    """Fetch one month and write its partition; returns the row count (0 if the month has no data yet)."""
+    response = http_cache.get(URL, params={"year": str(year), "month": f"{month:02d}"}, headers=HEADERS)
+    response.raise_for_status()
+    data = response.json()
+    if not data:
+        return 0
+
+    df = pd.DataFrame(data)
+    df["Year"] = str(year)
+    df["Month"] = f"{month:02d}"
+
+    # The partition file doubles as the checkpoint, so only complete months land on disk
+    path = partition_path(year, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df[COLUMNS].to_csv(path + ".tmp", index=False, encoding="utf-8-sig")
+    os.replace(path + ".tmp", path)
+    return len(df)
+
+
+def backfill(start_ym, end_ym, workers=WORKERS, force=False, revision_months=REVISION_MONTHS):
+    """Fetch every month in ``[start_ym, end_ym]`` not already on disk, ``workers`` requests at a time.
+
+    The last ``revision_months`` stored months are fetched again as well,
+    since the IEA revises recent figures after first publishing them.
+    """
+    months = month_range(start_ym, end_ym)
+    stored = [m for m in months if os.path.exists(partition_path(*m))]
+    revise = set(stored[-revision_months:]) if revision_months else set()
+    todo = [m for m in months if force or m in revise or m not in stored]
+    print(f"📦 {len(stored)} of {len(months)} months already stored, fetching {len(todo)} "
+          f"({len(revise)} for revisions)")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_month, year, month): (year, month) for year, month in todo}
+        for future in as_completed(futures):
+            year, month = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                failed.append((year, month))
+                print(f"❌ Failed to fetch {year}-{month:02d}: {e}")
+                continue
+            if rows:
+                print(f"✅ {year}-{month:02d}: {rows} rows")
+            else:
+                print(f"No data for {year}-{month:02d}")
+    return failed
+
+
+def combine_partitions():
+    """Concatenate every stored month into the single CSV the processing step reads."""
+    paths = sorted(glob.glob(os.path.join(PARTITION_DIR, "year=*", "month=*.csv")))
+    if not paths:
+        raise SystemExit("No IEA oil stock partitions to combine")
+    df = pd.concat([pd.read_csv(p, dtype={"Year": str, "Month": str}) for p in paths], ignore_index=True)
+    df["Month"] = pd.to_datetime(df["Year"] + "-" + df["Month"].str.zfill(2) + "-01").dt.strftime("%B")
+    landing.write_raw(df, SAVE_PATH)
+    print(f"Data saved to iea_oil_stocks.csv ({len(paths)} months, {len(df)} rows)")
+
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Backfill IEA monthly oil stocks")
+    parser.add_argument("--start", default=f"{today.year}-01", help="first month, YYYY-MM")
+    parser.add_argument("--end", default=f"{today.year}-{today.month:02d}", help="last month, YYYY-MM")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--force", action="store_true", help="refetch months that are already stored")
+    parser.add_argument("--revision-months", type=int, default=REVISION_MONTHS,
+                        help="latest stored months to refetch for revisions")
+    args, _ = parser.parse_known_args()
+
+    failed = backfill(args.start, args.end, workers=args.workers, force=args.force,
+                      revision_months=args.revision_months)
+    combine_partitions()
+    if failed:
+        raise SystemExit(f"{len(failed)} month(s) failed; rerun to retry them")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 import os
-import requests
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
+from src.utils import http_cache
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
@@ -29,7 +29,7 @@ url = (
     "&ProdNMList=ALL"
 )
 
-response = requests.get(url)
+response = http_cache.get(url)
 response.raise_for_status()  # raise error if failed
 
 with open(filepath, "wb") as f:
@@ -1,16 +1,15 @@
-import requests
 import pandas as pd
 from datetime import datetime
-import time
 import os
 from dotenv import load_dotenv
+from src.utils import landing
+from src.utils.ecos import SeriesQuery, fetch_all
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
 # Parameters
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 start_date = '202001'
 end_date = datetime.now().strftime('%Y%m')
 stat_codes = ['901Y026', '901Y066']  # 제조업재고율, 설비투자지수
@@ -18,17 +17,14 @@ cycle = 'M'
 
 # Function
 def fetch_data(stat_codes):
-    all_data = []
-    for code in stat_codes:
-        url = f"{base_url}/{api_key}/json/kr/1/10000/{code}/{cycle}/{start_date}/{end_date}/"
-        response = requests.get(url)
+    queries = [SeriesQuery(code, cycle, start_date, end_date) for code in stat_codes]
+    results = fetch_all(queries, api_key=api_key)
 
-        data = response.json()
-        rows = data.get('StatisticSearch', {}).get('row', [])
+    all_data = []
+    for code, rows in zip(stat_codes, results):
         for row in rows:
             row['STAT_CODE'] = code
             all_data.append(row)
-        time.sleep(0.3)
     return all_data
 
 # Run
@@ -47,6 +43,6 @@ df.drop(columns=cols_to_drop, inplace=True, errors='ignore')
 # Save to CSV
 save_path = os.path.join(data_dir, "industry", "manufacture_inventory.csv")
 os.makedirs(os.path.dirname(save_path), exist_ok=True)
-df.to_csv(save_path, index=False, encoding="utf-8-sig")
+landing.write_raw(df, save_path)
 print("Data saved to manufacture_inventory.csv")
 
@@ -3,14 +3,34 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webelement import WebElement
+import json
+import re
 import pandas as pd
 import os
 from dotenv import load_dotenv
+from src.utils import landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
+# One round-trip per table: strip <sup> footnotes on a clone and return header + cell text as JSON
+EXTRACT_TABLE_JS = """
+const table = arguments[0];
+const clean = el => {
+    const copy = el.cloneNode(true);
+    copy.querySelectorAll('sup').forEach(s => s.remove());
+    return copy.textContent.replace(/\\s+/g, ' ').trim();
+};
+const header = table.querySelector('div.sdv-ranking-header, div.sdv-ranking-head');
+const headers = header ? Array.from(header.querySelectorAll('span, div')).map(clean) : [];
+const rows = Array.from(table.querySelectorAll('div.sdv-ranking-body > div.sdv-ranking-row'))
+    .map(row => Array.from(row.querySelectorAll('span')).map(clean));
+return JSON.stringify({headers: headers, rows: rows});
+"""
+
+# e.g. "May 2025" or "Jan-May 2025"
+PERIOD_PATTERN = re.compile(r"\b((?:[A-Z][a-z]{2}\s*[-–]\s*)?[A-Z][a-z]{2,8})\s+(\d{4})\b")
+
 
 def initialize_browser():
     options = Options()
@@ -22,46 +42,38 @@ def initialize_browser():
     return driver
 
 
-def clean_span_text(element: WebElement, driver):
-    # Remove all <sup> tags
-    driver.execute_script("arguments[0].querySelectorAll('sup').forEach(s => s.remove())", element)
-    return element.text.strip()
-
-def region_table(driver):
-    container = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.XPATH, "//sro-table[@table='3']"))
+def parse_period_labels(headers):
+    """Turn header text into the two YoY column labels, e.g. ["May 2025 YoY (%)", "Jan–May 2025 YoY (%)"]."""
+    periods = []
+    for text in headers:
+        match = PERIOD_PATTERN.search(text)
+        if match:
+            months = re.sub(r"\s*[-–]\s*", "–", match.group(1))
+            label = f"{months} {match.group(2)} YoY (%)"
+            if label not in periods:
+                periods.append(label)
+    if len(periods) < 2:
+        raise ValueError(f"Could not find the two period columns in table header: {headers}")
+    return periods[:2]
+
+def extract_table(driver, table_id, name_column):
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, f"sro-table[table='{table_id}'] div.sdv-ranking-row"))
     )
+    container = driver.find_element(By.CSS_SELECTOR, f"sro-table[table='{table_id}']")
+    table = json.loads(driver.execute_script(EXTRACT_TABLE_JS, container))
 
-    rows = container.find_elements(By.CSS_SELECTOR, "div.sdv-ranking-body > div.sdv-ranking-row")
+    month_col, ytd_col = parse_period_labels(table["headers"])
+    return [
+        {name_column: cells[0], month_col: cells[1], ytd_col: cells[2]}
+        for cells in table["rows"] if len(cells) >= 3
+    ]
 
-    data = []
-    for row in rows:
-        cells = [clean_span_text(el, driver) for el in row.find_elements(By.TAG_NAME, "span")]
-        if len(cells) >= 3:
-            data.append({
-                "Region": cells[0],
-                "May 2025 YoY (%)": cells[1],
-                "Jan–May 2025 YoY (%)": cells[2]
-            })
-    return data
+def region_table(driver):
+    return extract_table(driver, 3, "Region")
 
 def country_table(driver):
-    container = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.XPATH, "//sro-table[@table='4']"))
-    )
-
-    rows = container.find_elements(By.CSS_SELECTOR, "div.sdv-ranking-body > div.sdv-ranking-row")
-
-    data = []
-    for row in rows:
-        cells = [clean_span_text(el, driver) for el in row.find_elements(By.TAG_NAME, "span")]
-        if len(cells) >= 3:
-            data.append({
-                "Country": cells[0],
-                "May 2025 YoY (%)": cells[1],
-                "Jan–May 2025 YoY (%)": cells[2]
-            })
-    return data
+    return extract_table(driver, 4, "Country")
 
 def main():
     base_url = "https://worldsteel.org/data/steel-data-viewer/?ind=CSP-PERC/"
@@ -85,7 +97,7 @@ def main():
 
         # Save
         output_path = os.path.join(data_dir, "industry", "steel_combined.csv")
-        combined_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+        landing.write_raw(combined_df, output_path)
 
         print(f"Data saved to {output_path}.")
     finally:
@@ -0,0 +1,200 @@
+"""Benchmark the vectorized WSTS "Monthly Data" parser against the old iterrows loop.
+
+    python bench_wsts_billings.py                      # $DATA_DIR/trade/wsts_billings_latest.xlsx
+    python bench_wsts_billings.py path/to/workbook.xlsx
+    python bench_wsts_billings.py --synthetic 1986     # generated workbook covering 1986..today
+
+Both parsers run on the same loaded sheet; the script checks that they
+produce the same rows in the same order before reporting timings.
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from sector_process import WSTS_PERIODS, WSTS_REGIONS, parse_wsts_billings
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+
+def legacy_parse(df):
+    """The previous row-by-row parser, kept verbatim for comparison."""
+
+    # Define the columns
+    months = ['January', 'February', 'March', 'April', 'May', 'June', 
+              'July', 'August', 'September', 'October', 'November', 'December']
+    quarters = ['Q1', 'Q2', 'Q3', 'Q4']
+    total_year = 'Total Year'
+
+    # Create a clean dataframe with year and region info
+    result_rows = []
+    current_year = None
+    
+    for idx, row in df.iterrows():
+        first_col = str(row.iloc[0]).strip()
+        
+        # Check if this row contains a year
+        if first_col.isdigit() and len(first_col) == 4:
+            current_year = int(first_col)
+            continue
+            
+        # Check if this row contains region data
+        regions = ['Americas', 'Europe', 'Japan', 'Asia Pacific', 'Worldwide']
+        if first_col in regions and current_year is not None:
+            region = first_col
+            
+            # Extract monthly values
+            for month in months:
+                value = row[month]
+                if pd.notna(value) and value != '':
+                    try:
+                        # Convert value to numeric, handling potential formatting
+                        if isinstance(value, str):
+                            value = value.replace(',', '').replace('$', '')
+                        value = float(value)
+                        
+                        result_rows.append({
+                            'year': current_year,
+                            'period': month,
+                            'period_type': 'month',
+                            'region': region,
+                            'value': value
+                        })
+                    except (ValueError, TypeError):
+                        # Skip invalid values
+                        continue
+            
+            # Extract quarterly values
+            for quarter in quarters:
+                value = row[quarter]
+                if pd.notna(value) and value != '':
+                    try:
+                        # Convert value to numeric, handling potential formatting
+                        if isinstance(value, str):
+                            value = value.replace(',', '').replace('$', '')
+                        value = float(value)
+                        
+                        result_rows.append({
+                            'year': current_year,
+                            'period': quarter,
+                            'period_type': 'quarter',
+                            'region': region,
+                            'value': value
+                        })
+                    except (ValueError, TypeError):
+                        # Skip invalid values
+                        continue
+            
+            # Extract total year value
+            if total_year:
+                value = row[total_year]
+                if pd.notna(value) and value != '':
+                    try:
+                        # Convert value to numeric, handling potential formatting
+                        if isinstance(value, str):
+                            value = value.replace(',', '').replace('$', '')
+                        value = float(value)
+                        
+                        result_rows.append({
+                            'year': current_year,
+                            'period': 'Total Year',
+                            'period_type': 'annual',
+                            'region': region,
+                            'value': value
+                        })
+                    except (ValueError, TypeError):
+                        # Skip invalid values
+                        continue
+    
+    # Create DataFrame from results
+    df_long = pd.DataFrame(result_rows)
+
+    # Create proper date column for monthly data only
+    df_long['date'] = None
+    monthly_mask = df_long['period_type'] == 'month'
+    df_long.loc[monthly_mask, 'date'] = pd.to_datetime(
+        df_long.loc[monthly_mask, 'year'].astype(str) + '-' + 
+        df_long.loc[monthly_mask, 'period'] + '-01',
+        errors='coerce'
+    )
+    
+    # For quarterly data, create approximate dates (middle of quarter)
+    quarterly_mask = df_long['period_type'] == 'quarter'
+    quarter_to_month = {'Q1': '02-15', 'Q2': '05-15', 'Q3': '08-15', 'Q4': '11-15'}
+    for quarter, month_day in quarter_to_month.items():
+        mask = quarterly_mask & (df_long['period'] == quarter)
+        df_long.loc[mask, 'date'] = pd.to_datetime(
+            df_long.loc[mask, 'year'].astype(str) + '-' + month_day,
+            errors='coerce'
+        )
+    
+    # For annual data, use middle of year
+    annual_mask = df_long['period_type'] == 'annual'
+    df_long.loc[annual_mask, 'date'] = pd.to_datetime(
+        df_long.loc[annual_mask, 'year'].astype(str) + '-07-01',
+        errors='coerce'
+    )
+    df_long['date'] = pd.to_datetime(df_long['date'], errors='coerce')
+    df_long['date'] = df_long['date'].dt.strftime('%Y-%m-%d')
+    return df_long
+
+
+def synthetic_sheet(first_year):
+    """A sheet laid out like the WSTS workbook: a year marker row, then one row per region."""
+    rng = np.random.default_rng(0)
+    today = date.today()
+    rows = []
+    for year in range(first_year, today.year + 1):
+        rows.append([str(year)] + [np.nan] * len(WSTS_PERIODS))
+        for region in WSTS_REGIONS:
+            months = rng.uniform(1e5, 5e7, 12).round(0)
+            if year == today.year:
+                months[today.month - 1:] = np.nan
+            quarters = [months[i:i + 3].sum() for i in range(0, 12, 3)]
+            values = list(months) + quarters + [months.sum()]
+            # The workbook mixes numbers with formatted text cells
+            values[0] = f"{values[0]:,.0f}"
+            rows.append([region] + values)
+        rows.append([np.nan] * (len(WSTS_PERIODS) + 1))
+    return pd.DataFrame(rows, columns=['Region'] + list(WSTS_PERIODS.index))
+
+
+def best_of(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workbook", nargs="?", default=os.path.join(DATA_DIR or ".", "trade", "wsts_billings_latest.xlsx"))
+    parser.add_argument("--synthetic", type=int, metavar="FIRST_YEAR", help="benchmark a generated sheet instead")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        df = synthetic_sheet(args.synthetic)
+        source = f"synthetic {args.synthetic}-{date.today().year}"
+    else:
+        df = pd.read_excel(args.workbook, sheet_name='Monthly Data', header=3)
+        source = args.workbook
+
+    legacy_s, legacy = best_of(legacy_parse, df, args.repeat)
+    vector_s, vector = best_of(parse_wsts_billings, df, args.repeat)
+
+    columns = ['year', 'period', 'period_type', 'region', 'value', 'date']
+    pd.testing.assert_frame_equal(legacy[columns].reset_index(drop=True), vector[columns].reset_index(drop=True),
+                                  check_dtype=False)
+
+    print(f"Workbook: {source} ({len(df)} sheet rows → {len(vector)} values)")
+    print(f"iterrows parser:   {legacy_s * 1000:8.1f} ms")
+    print(f"vectorized parser: {vector_s * 1000:8.1f} ms")
+    print(f"speed-up:          {legacy_s / vector_s:8.1f}x")
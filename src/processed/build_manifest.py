@@ -0,0 +1,124 @@
+"""Build manifest for the ETL.
+
+``run_all`` records, per transform, a hash of the raw file it read and of the
+transform's source code (its module and every project module that module
+uses, plus project data files those modules point at such as
+``geo_entities.csv``, so edits to helpers count too). Tasks whose hashes still match (and whose output
+exists) are skipped. Rebuilt tasks are flagged ``dirty`` until a downstream
+stage (upload, EDA) has consumed their output and calls ``mark_clean``.
+
+Stdlib only, so it can be imported from ``src/processed`` scripts and from
+the repo root alike.
+"""
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+MANIFEST_PATH = os.path.join(DATA_DIR or ".", ".state", "etl_manifest.json")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_project_file(path):
+    path = os.path.abspath(path)
+    return path.startswith(PROJECT_ROOT + os.sep) and "site-packages" not in path
+
+
+def project_modules(module):
+    """``module`` and every project module it reaches through its globals, sorted by path."""
+    found, todo = {}, [module]
+    while todo:
+        current = todo.pop()
+        path = getattr(current, "__file__", None)
+        if not path or path in found or not _is_project_file(path):
+            continue
+        found[path] = current
+        for value in vars(current).values():
+            if inspect.ismodule(value):
+                todo.append(value)
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                dependency = inspect.getmodule(value)
+                if dependency is not None:
+                    todo.append(dependency)
+    return [found[path] for path in sorted(found)]
+
+
+def code_hash(func, extra=()):
+    """Hash of the modules behind ``func`` plus any extra arguments it is called with (e.g. a direction).
+
+    The whole defining module and the project modules it uses are hashed, not
+    just ``func``: most transforms delegate to module-level helpers.
+    """
+    digest = hashlib.sha256()
+    for module in project_modules(inspect.getmodule(func)):
+        digest.update(os.path.relpath(module.__file__, PROJECT_ROOT).encode("utf-8"))
+        digest.update(inspect.getsource(module).encode("utf-8"))
+        # Lookup tables shipped with the code, e.g. geo.TABLE_PATH
+        for value in vars(module).values():
+            if isinstance(value, str) and os.path.isabs(value) and _is_project_file(value) and os.path.isfile(value):
+                digest.update(file_hash(value).encode("utf-8"))
+    digest.update(repr(tuple(extra)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_fresh(entry, input_sha, code_sha):
+    return (entry is not None and entry.get("input") == input_sha and entry.get("code") == code_sha
+            and os.path.exists(entry.get("output", "")))
+
+
+def record(manifest, name, input_sha, code_sha, output):
+    manifest[name] = {
+        "input": input_sha,
+        "code": code_sha,
+        "output": os.path.abspath(output),
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "dirty": True,
+    }
+
+
+def dirty_outputs(path=MANIFEST_PATH):
+    """Processed files rebuilt since a downstream stage last called ``mark_clean``."""
+    return sorted(entry["output"] for entry in load(path).values() if entry.get("dirty"))
+
+
+def clean_outputs(path=MANIFEST_PATH):
+    """Processed files a downstream stage has already consumed since they were last rebuilt."""
+    return sorted(os.path.abspath(entry["output"]) for entry in load(path).values() if not entry.get("dirty"))
+
+
+def mark_clean(outputs, path=MANIFEST_PATH):
+    outputs = {os.path.abspath(o) for o in outputs}
+    manifest = load(path)
+    for entry in manifest.values():
+        if os.path.abspath(entry.get("output", "")) in outputs:
+            entry["dirty"] = False
+    save(manifest, path)
@@ -0,0 +1,83 @@
+"""Country / entity resolution shared by the transforms and collectors.
+
+Backed by ``geo_entities.csv``: one row per ISO country (from pycountry)
+plus non-country entities such as Petronet's 중립지대 and 합 계. Columns:
+
+    iso2, iso3     ISO 3166 codes
+    name           ISO name ("Korea, Republic of")
+    common_name    display name ("South Korea")
+    name_ko        Korean name; alternative spellings separated by "|"
+    continent      Africa, Asia, Europe, North/South America, Oceania, Antarctica
+    region         reporting region (Asia, Africa, America, MiddleEast, Europe);
+                   Oceania and Central Asia roll up into Asia as in the Petronet data
+
+The table is loaded once per process on first use and every lookup is a
+single ``Series.map`` hash join:
+
+    df['country'] = geo.resolve(df['expIsoWd2NatCd'], by='iso2', to='name', keep_unmatched=True)
+
+Regenerate the ISO columns after a pycountry upgrade with
+``python geo.py --build``; the hand-maintained columns are kept.
+"""
+import argparse
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo_entities.csv")
+KEYS = ("iso2", "iso3", "name", "common_name", "name_ko")
+
+
+@lru_cache(maxsize=None)
+def table():
+    # keep_default_na=False: Namibia's ISO2 code is "NA"
+    return pd.read_csv(TABLE_PATH, dtype=str, keep_default_na=False, encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def _lookup(by, to):
+    if by not in KEYS:
+        raise ValueError(f"Cannot resolve by {by!r}; expected one of {KEYS}")
+    entities = table()
+    keys = entities[by].str.split("|") if by == "name_ko" else entities[by]
+    pairs = pd.DataFrame({"key": keys, "value": entities[to]}).explode("key")
+    pairs = pairs[(pairs["key"] != "") & (pairs["value"] != "")]
+    return pairs.drop_duplicates("key").set_index("key")["value"]
+
+
+def resolve(series, by="iso2", to="common_name", keep_unmatched=False):
+    """Map ``series`` (keys of kind ``by``) to column ``to``; misses are NaN unless ``keep_unmatched``."""
+    resolved = series.map(_lookup(by, to))
+    return resolved.fillna(series) if keep_unmatched else resolved
+
+
+def build_table():
+    """Refresh ISO rows from pycountry, keeping hand-maintained columns and non-ISO entities."""
+    import pycountry
+
+    current = table()
+    manual = current[current["iso2"] != ""].set_index("iso2")
+    rows = []
+    for country in pycountry.countries:
+        known = manual.loc[country.alpha_2] if country.alpha_2 in manual.index else None
+        rows.append({
+            "iso2": country.alpha_2,
+            "iso3": country.alpha_3,
+            "name": country.name,
+            "common_name": known["common_name"] if known is not None
+            else getattr(country, "common_name", None) or country.name,
+            "name_ko": known["name_ko"] if known is not None else "",
+            "continent": known["continent"] if known is not None else "",
+            "region": known["region"] if known is not None else "",
+        })
+    entities = pd.concat([pd.DataFrame(rows), current[current["iso2"] == ""]], ignore_index=True)
+    entities.to_csv(TABLE_PATH, index=False, encoding="utf-8")
+    print(f"Wrote {len(entities)} entities to {TABLE_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Country / entity lookup table")
+    parser.add_argument("--build", action="store_true", help="regenerate ISO columns from pycountry")
+    if parser.parse_args().build:
+        build_table()
@@ -1,10 +1,17 @@
+import argparse
 import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 load_dotenv()
 DATA_DIR = os.getenv("DATA_DIR")
 
-from sector_process import crop_production, bid_info, confidence, fxrate, economic_indicator, \
+import build_manifest
+import transform_spec
+from sector_process import SPECS, raw_source, crop_production, bid_info, confidence, fxrate, economic_indicator, \
     iea_oil_stocks, oil_import_summary, manufacture_inventory, steel_combined, global_trade_variation_top5, global_trade_trend, \
     global_export, korea_trade_trend, korea_export_import_items, ecos_trade_detail, ecos_trade_items, shipping_indices, wsts_billings
 
@@ -42,29 +49,94 @@ KOREA_EXPORT_IMPORT_ITEMS = [
     ("korea_import_increase_items", "import")
 ]
 
-def run_all():
+def build_jobs():
+    """Flatten every transform into ``(name, func, args)``; each job reads and writes its own files."""
+    jobs = []
     for func, sector, name in TASKS:
         input_path = os.path.join(DATA_DIR, sector, name)
         output_path = os.path.join(DATA_DIR, "processed", sector, f"{os.path.splitext(name)[0]}_processed.csv")
-        if name.endswith(".xlsx"):
-            func(input_path, output_path)
+        if not name.endswith(".xlsx"):
+            input_path += ".csv"
+        jobs.append((name, func, (input_path, output_path)))
+
+    for items, func in ((GLOBAL_EXPORT_ITEMS, global_export),
+                        (KOREA_TRADE_TREND, korea_trade_trend),
+                        (KOREA_EXPORT_IMPORT_ITEMS, korea_export_import_items)):
+        for name, direction in items:
+            input_path = os.path.join(DATA_DIR, "trade", f"{name}.csv")
+            output_path = os.path.join(DATA_DIR, "processed", "trade", f"{name}_processed.csv")
+            jobs.append((name, func, (input_path, output_path, direction)))
+    return jobs
+
+def run_job(name, func, args):
+    """Run one transform; returns ``(name, status, seconds, detail)`` instead of raising."""
+    started = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(args[1]), exist_ok=True)
+        func(*args)
+        return name, "ok", time.perf_counter() - started, ""
+    except Exception as e:
+        traceback.print_exc()
+        return name, "failed", time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+def plan(work, manifest, force=False):
+    """Split jobs into ``(to_run, skipped)``; ``to_run`` carries each job's input and code hashes."""
+    to_run, skipped = [], []
+    for name, func, args in work:
+        source = raw_source(args[0])
+        input_sha = build_manifest.file_hash(source) if os.path.exists(source) else None
+        # Spec-driven transforms are one-line wrappers; their spec and the engine are the real code
+        spec = SPECS.get(func.__name__)
+        code_sha = build_manifest.code_hash(func, args[2:] + ((transform_spec.fingerprint(spec),) if spec else ()))
+        if not force and input_sha and build_manifest.is_fresh(manifest.get(name), input_sha, code_sha):
+            skipped.append((name, "skipped", 0.0, "input and code unchanged"))
         else:
-            func(input_path + ".csv", output_path)
+            to_run.append(((name, func, args), input_sha, code_sha))
+    return to_run, skipped
 
-    for name, direction in GLOBAL_EXPORT_ITEMS:
-        input_path = os.path.join(DATA_DIR, "trade", f"{name}.csv")
-        output_path = os.path.join(DATA_DIR, "processed", "trade", f"{name}_processed.csv")
-        global_export(input_path, output_path, direction)
+def run_all(jobs=1, force=False):
+    """Run every changed transform, ``jobs`` at a time in a process pool; one failure does not stop the rest."""
+    manifest = build_manifest.load()
+    to_run, results = plan(build_jobs(), manifest, force)
+    hashes = {job[0]: (job, input_sha, code_sha) for job, input_sha, code_sha in to_run}
 
-    for name, direction in KOREA_TRADE_TREND:
-        input_path = os.path.join(DATA_DIR, "trade", f"{name}.csv")
-        output_path = os.path.join(DATA_DIR, "processed", "trade", f"{name}_processed.csv")
-        korea_trade_trend(input_path, output_path, direction)
+    if jobs <= 1:
+        outcomes = [run_job(*job) for job, _, _ in to_run]
+    else:
+        outcomes = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_job, *job) for job, _, _ in to_run]
+            for future in as_completed(futures):
+                outcomes.append(future.result())
 
-    for name, direction in KOREA_EXPORT_IMPORT_ITEMS:
-        input_path = os.path.join(DATA_DIR, "trade", f"{name}.csv")
-        output_path = os.path.join(DATA_DIR, "processed", "trade", f"{name}_processed.csv")
-        korea_export_import_items(input_path, output_path, direction)
+    # Successful builds are recorded as dirty for downstream stages; failures are forgotten so they rerun
+    for name, status, _, _ in outcomes:
+        (_, _, args), input_sha, code_sha = hashes[name]
+        if status == "ok" and input_sha:
+            build_manifest.record(manifest, name, input_sha, code_sha, args[1])
+        else:
+            manifest.pop(name, None)
+    build_manifest.save(manifest)
+    return results + outcomes
+
+def print_report(results, wall_seconds):
+    print("\n=== ETL SUMMARY ===")
+    print(f"{'task':<40} {'status':<7} {'secs':>7}  detail")
+    for name, status, seconds, detail in sorted(results, key=lambda r: -r[2]):
+        print(f"{name:<40} {status:<7} {seconds:>7.2f}  {detail}")
+    counts = {status: sum(r[1] == status for r in results) for status in ("ok", "skipped", "failed")}
+    print(f"\n{counts['ok']} rebuilt, {counts['skipped']} unchanged, {counts['failed']} failed, "
+          f"wall time {wall_seconds:.1f}s")
 
 if __name__ == "__main__":
-    run_all()
+    parser = argparse.ArgumentParser(description="Process raw data into data/processed")
+    parser.add_argument("--jobs", type=int, default=1, help="transforms to run in parallel (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild every transform, ignoring the manifest")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run_all(jobs=args.jobs or os.cpu_count(), force=args.force)
+    print_report(results, time.perf_counter() - started)
+
+    if any(status == "failed" for _, status, _, _ in results):
+        sys.exit(1)
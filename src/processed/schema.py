@@ -0,0 +1,73 @@
+"""Dtype schema for the processed layer.
+
+Every processed frame uses the same column types:
+
+    dimensions   low-cardinality labels (sector, source, country, unit, indicator, ...)
+                 -> ``category``, so each distinct string is stored once per column
+    date         -> ``datetime64[ns]``
+    measures     every other numeric column -> pyarrow-backed ``int64[pyarrow]`` / ``double[pyarrow]``
+    text         every other string column (item names, free text) -> ``string[pyarrow]``
+
+``save`` writes the processed CSV exactly as before and a typed Parquet twin
+next to it (``*_processed.parquet``); ``read`` prefers the Parquet twin, so the
+schema survives the round trip for ``upload_postgres.py`` and later stages.
+
+Pandas only, so it can be imported from ``src/processed`` scripts and from
+the repo root alike.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+DIMENSIONS = (
+    "sector", "source", "country", "partner", "region", "unit", "indicator", "category",
+    "commodity", "currency", "quote", "agency", "period", "period_type", "frequency",
+    "domain", "file_source", "pair",
+)
+DATE_COLUMNS = ("date",)
+TEXT = pd.StringDtype("pyarrow")
+
+
+def _measure_dtype(series):
+    if pd.api.types.is_integer_dtype(series):
+        return pd.ArrowDtype(pa.int64())
+    return pd.ArrowDtype(pa.float64())
+
+
+def apply(df):
+    """Return ``df`` with the processed-layer dtypes; unknown string columns become ``string[pyarrow]``."""
+    typed = {}
+    for col in df.columns:
+        series = df[col]
+        if col in DIMENSIONS:
+            typed[col] = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+        elif col in DATE_COLUMNS:
+            typed[col] = pd.to_datetime(series, format="ISO8601").astype("datetime64[ns]")
+        elif pd.api.types.is_bool_dtype(series):
+            typed[col] = series
+        elif pd.api.types.is_numeric_dtype(series):
+            typed[col] = series.astype(_measure_dtype(series))
+        else:
+            typed[col] = series.astype(TEXT)
+    return pd.DataFrame(typed, index=df.index)
+
+
+def parquet_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def save(df, output_path, encoding="utf-8-sig"):
+    """Write the processed CSV and its typed Parquet twin."""
+    df.to_csv(output_path, index=False, encoding=encoding)
+    tmp_path = parquet_path(output_path) + ".tmp"
+    apply(df).to_parquet(tmp_path, index=False, compression="zstd")
+    os.replace(tmp_path, parquet_path(output_path))
+
+
+def read(csv_path):
+    """Load a processed file with the schema applied, from its Parquet twin when it is current."""
+    twin = parquet_path(csv_path)
+    if os.path.exists(twin) and os.path.getmtime(twin) >= os.path.getmtime(csv_path):
+        return apply(pd.read_parquet(twin))
+    return apply(pd.read_csv(csv_path, encoding="utf-8-sig", engine="pyarrow", dtype_backend="pyarrow"))
@@ -0,0 +1,138 @@
+"""Declarative transforms for the processed layer.
+
+Most sources need the same sequence: pick a date, rename, clean numbers,
+map ISO codes, add static columns, melt indicators, attach units, sort.
+A spec describes that sequence for one dataset as a plain dict, and
+``transform(spec, df)`` runs it. Keys are optional and always run in this
+order:
+
+    filter      {raw_col: value}        drop rows where raw_col == value
+    skip_empty  [raw_col, ...]          drop rows that are empty apart from these columns
+    rename      {old: new}              missing columns are ignored
+    date        (template, format)      e.g. ("{baseYm}-01", "%Y%m-%d"); fields are columns
+    numeric     [col, ...]              to_numeric(errors='coerce')
+    percent     [col, ...]              "12.3%" -> 12.3
+    required    [col, ...]              drop rows where any of these is missing
+    integer     [col, ...]              cast to int (after ``required``)
+    derive      {col: (func, src)}      col = func(df[src]) for dataset-specific rules
+    geo         {col: (src, by, to)}    geo.resolve(df[src], by, to, keep_unmatched=True)
+    recode      {col: {old: new}}       Series.replace
+    lookup      {col: {old: new}}       Series.map (misses become NaN)
+    static      {col: value}            constant columns
+    params      {col: param}            constant columns taken from ``transform(..., **params)``
+    melt        {"id_vars": [...], "value_vars": [...]}   -> indicator / value
+    units       {indicator: unit}       unit column for melted rows
+    columns     [col, ...]              output columns, in order
+    optional    [col, ...]              output columns that may be absent from the source
+    sort        [col, ...]
+
+The engine works on a dict of column Series instead of a DataFrame, so
+renames and drops are free, constant columns stay scalars (also through
+the melt), and the output frame is built exactly once.
+"""
+import hashlib
+import inspect
+import string
+import sys
+
+import numpy as np
+import pandas as pd
+
+import geo
+
+
+def _template(cols, template):
+    """Concatenate the columns named in ``template`` (as str) with its literal text."""
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            parts.append(cols[field].astype(str))
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined + part
+    return joined
+
+
+def _keep(cols, mask):
+    return {col: s[mask] if isinstance(s, pd.Series) else s for col, s in cols.items()}
+
+
+def _melt(cols, id_vars, value_vars):
+    """``DataFrame.melt`` over the column dict; constant columns are carried through without repeating."""
+    n = len(cols[value_vars[0]])
+    positions = np.tile(np.arange(n), len(value_vars))
+    melted = {col: s for col, s in cols.items() if not isinstance(s, pd.Series)}
+    for col in id_vars:
+        s = cols[col]
+        melted[col] = s.iloc[positions].reset_index(drop=True) if isinstance(s, pd.Series) else s
+    melted["indicator"] = pd.Series(np.repeat(np.array(value_vars, dtype=object), n))
+    melted["value"] = pd.concat([cols[col] for col in value_vars], ignore_index=True)
+    return melted
+
+
+def transform(spec, df, **params):
+    """Run ``spec`` over the raw frame ``df`` and return the processed frame."""
+    for col, value in spec.get("filter", {}).items():
+        df = df[df[col] != value]
+    if "skip_empty" in spec:
+        df = df.dropna(how="all", subset=[col for col in df.columns if col not in spec["skip_empty"]])
+
+    cols = dict(df.items())
+    for old, new in spec.get("rename", {}).items():
+        if old in cols:
+            cols[new] = cols.pop(old)
+
+    if "date" in spec:
+        template, fmt = spec["date"]
+        cols["date"] = pd.to_datetime(_template(cols, template), format=fmt)
+    for col in spec.get("numeric", ()):
+        cols[col] = pd.to_numeric(cols[col], errors="coerce")
+    for col in spec.get("percent", ()):
+        cols[col] = cols[col].str.replace("%", "", regex=False).astype(float)
+    if "required" in spec:
+        cols = _keep(cols, np.logical_and.reduce([cols[col].notna().to_numpy() for col in spec["required"]]))
+    for col in spec.get("integer", ()):
+        cols[col] = cols[col].astype(int)
+
+    for col, (func, src) in spec.get("derive", {}).items():
+        cols[col] = func(cols[src])
+    for col, (src, by, to) in spec.get("geo", {}).items():
+        cols[col] = geo.resolve(cols[src], by=by, to=to, keep_unmatched=True)
+    for col, mapping in spec.get("recode", {}).items():
+        cols[col] = cols[col].replace(mapping)
+    for col, mapping in spec.get("lookup", {}).items():
+        cols[col] = cols[col].map(mapping)
+
+    cols.update(spec.get("static", {}))
+    cols.update({col: params[param] for col, param in spec.get("params", {}).items()})
+
+    if "melt" in spec:
+        value_vars = spec["melt"]["value_vars"]
+        cols = _melt(cols, spec["melt"]["id_vars"], value_vars)
+        if "units" in spec:
+            n = len(cols["value"]) // len(value_vars)
+            cols["unit"] = pd.Series(np.repeat(np.array([spec["units"].get(v) for v in value_vars], dtype=object), n))
+
+    optional = set(spec.get("optional", ()))
+    columns = [col for col in spec.get("columns", cols) if col in cols or col not in optional]
+    index = next(s.index for s in cols.values() if isinstance(s, pd.Series))
+    out = pd.DataFrame({col: cols[col] for col in columns}, index=index)
+    return out.sort_values(by=spec["sort"]) if "sort" in spec else out
+
+
+def _canonical(value):
+    if callable(value):
+        return inspect.getsource(value)
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def fingerprint(spec):
+    """Hash of ``spec`` (including the source of its ``derive`` functions) and of this engine."""
+    source = repr(_canonical(spec)) + inspect.getsource(sys.modules[__name__])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
@@ -1,11 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 import os
 from dotenv import load_dotenv
+from src.utils import http_cache, landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
@@ -37,7 +38,7 @@ class ShippingIndexScraper:
         """Scrape data from a single index page"""
         try:
             logger.info(f"Scraping {index_name} from {url}")
-            response = self.session.get(url, timeout=30)
+            response = http_cache.get(url, session=self.session, timeout=30)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -90,42 +91,57 @@ class ShippingIndexScraper:
             return None
 
     def scrape_all_indices(self):
-        """Scrape all shipping indices"""
-        all_data = []
-
-        for index_name, url in self.urls.items():
-            df = self.scrape_index_data(url, index_name)
-            if df is not None:
-                all_data.append(df)
-
-            # Be polite - add delay between requests
-            time.sleep(2)
+        """Scrape all shipping indices concurrently"""
+        with ThreadPoolExecutor(max_workers=len(self.urls)) as pool:
+            results = pool.map(lambda item: self.scrape_index_data(item[1], item[0]), self.urls.items())
+        return [df for df in results if df is not None]
+
+    def append_to_history(self, data_frames, history_file):
+        """Append unseen (index, date) observations to the long-format history store"""
+        new_obs = pd.concat([
+            pd.DataFrame({
+                'index': df['Index'],
+                'date': pd.to_datetime(df['Date'], format='%Y.%m.%d', errors='coerce'),
+                'value': pd.to_numeric(df[f"{df['Index'].iloc[0]}_Value"].str.replace(',', '', regex=False),
+                                       errors='coerce'),
+            })
+            for df in data_frames
+        ], ignore_index=True)
+        new_obs = new_obs.dropna(subset=['date']).drop_duplicates(subset=['index', 'date'], keep='last')
+        new_obs['ingested_at'] = datetime.now().strftime('%Y-%m-%d')
+
+        if os.path.exists(history_file):
+            # Only the keys are needed to decide what is new
+            seen = pd.read_csv(history_file, usecols=['index', 'date'], parse_dates=['date'])
+            seen_keys = pd.MultiIndex.from_frame(seen)
+            is_new = ~pd.MultiIndex.from_frame(new_obs[['index', 'date']]).isin(seen_keys)
+            new_obs = new_obs[is_new]
+            new_obs.to_csv(history_file, mode='a', header=False, index=False, date_format='%Y-%m-%d')
+        else:
+            new_obs.to_csv(history_file, index=False, encoding='utf-8-sig', date_format='%Y-%m-%d')
 
-        return all_data
+        logger.info(f"Appended {len(new_obs)} new observations to {history_file}")
+        return pd.read_csv(history_file, parse_dates=['date'], encoding='utf-8-sig')
 
-    def merge_and_save_data(self, data_frames, output_file='shipping_indices.csv'):
-        """Merge all data frames and save to CSV"""
+    def merge_and_save_data(self, data_frames, output_file='shipping_indices.csv',
+                            history_file='shipping_index_history.csv'):
+        """Append to the history store and save the full history as a wide CSV"""
         if not data_frames:
             logger.error("No data to save")
             return False
 
         try:
-            # Start with the first dataframe
-            merged_df = data_frames[0][['Date', f'{data_frames[0]["Index"].iloc[0]}_Value']].copy()
-
-            # Merge with other dataframes on Date
-            for df in data_frames[1:]:
-                index_name = df['Index'].iloc[0]
-                temp_df = df[['Date', f'{index_name}_Value']].copy()
-                merged_df = merged_df.merge(temp_df, on='Date', how='outer')
-
-            # Sort by date
-            merged_df['Date'] = pd.to_datetime(merged_df['Date'])
-            merged_df = merged_df.sort_values('Date')
+            history = self.append_to_history(data_frames, history_file)
+
+            # Wide view (one column per index) for the processing step
+            merged_df = history.pivot(index='date', columns='index', values='value')
+            merged_df = merged_df.reindex(columns=[name for name in self.urls if name in merged_df.columns])
+            merged_df.columns = [f'{name}_Value' for name in merged_df.columns]
+            merged_df = merged_df.sort_index().reset_index().rename(columns={'date': 'Date'})
             merged_df['Date'] = merged_df['Date'].dt.strftime('%Y.%m.%d')
 
             # Save to CSV
-            merged_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+            landing.write_raw(merged_df, output_file)
             logger.info(f"Data saved to {output_file}")
             logger.info(f"Total records: {len(merged_df)}")
 
@@ -163,7 +179,8 @@ def main():
         output_dir = os.path.join(data_dir, "trade")
         os.makedirs(os.path.dirname(output_dir), exist_ok=True)
         output_path = os.path.join(output_dir, "shipping_indices.csv")
-        success = scraper.merge_and_save_data(data_frames, output_file=output_path)
+        history_path = os.path.join(output_dir, "shipping_index_history.csv")
+        success = scraper.merge_and_save_data(data_frames, output_file=output_path, history_file=history_path)
 
         if success:
             print("\n✅ Scraping completed successfully!")
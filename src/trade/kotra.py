@@ -1,8 +1,8 @@
-import requests
 import json
 import pandas as pd
 import os
 from dotenv import load_dotenv
+from src.utils import http_cache, landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
@@ -16,7 +16,7 @@ params = {
     "hscd": "ALL"
 }
 
-r = requests.get(url, params=params)
+r = http_cache.get(url, params=params)
 data = r.json()
 
 # Save raw JSON
@@ -51,7 +51,7 @@ for key, filename in export_map.items():
             df = df.drop(columns=[col for col in cols_to_check if df[col].isna().all() or df[col].eq("").all()])
 
         save_path = os.path.join(output_dir, filename)
-        df.to_csv(save_path, index=False, encoding="utf-8-sig")
+        landing.write_raw(df, save_path)
         exported_files.append(save_path)
 
 print("✅ Exported CSV files:")
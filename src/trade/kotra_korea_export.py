@@ -1,11 +1,11 @@
-import requests
 import json
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-import time
 import os
 from dotenv import load_dotenv
+from src.utils import http_cache, landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
@@ -21,36 +21,80 @@ EXPORT_PARAMS = {
 }
 IMPORT_PARAMS = EXPORT_PARAMS.copy()
 IMPORT_PARAMS["korExpImp"] = "imp"
+LOOKBACK_MONTHS = 12
+STATE_PATH = os.path.join(data_dir, ".state", "kotra_korea_export.json")
 
 # ---------------------------
 # Functions
 # ---------------------------
 
+def has_rows(data):
+    return isinstance(data, dict) and any(isinstance(v, list) and v for v in data.values())
+
 def fetch_data(baseYr, baseMn, params):
-    params["baseYr"] = str(baseYr)
-    params["baseMn"] = str(baseMn)
-    try:
-        r = requests.get(BASE_URL, params=params)
-        r.raise_for_status()
-        data = r.json()
-        if isinstance(data, dict) and any(isinstance(v, list) and v for v in data.values()):
-            return data
-        return None
-    except Exception:
+    """Payload for one month, or None if KOTRA has not published it yet.
+
+    Network/HTTP errors propagate once the shared retry policy gives up, so a
+    flapping source fails the run instead of quietly looking like "no data".
+    Empty "no data" bodies are not cached, so a newly published month shows
+    up on the next run instead of after the cache TTL.
+    """
+    params = {**params, "baseYr": str(baseYr), "baseMn": str(baseMn)}
+    r = http_cache.get(BASE_URL, params=params, cache_if=lambda response: has_rows(response.json()))
+    r.raise_for_status()
+    data = r.json()
+    return data if has_rows(data) else None
+
+def load_last_good():
+    if not os.path.exists(STATE_PATH):
         return None
+    with open(STATE_PATH, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return datetime(state["year"], state["month"], 1)
 
-def get_latest_valid_data():
+def save_last_good(year, month):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"year": year, "month": month}, f)
+
+def candidate_months(last_good):
+    """Months from the current one back to ``last_good`` (or the full lookback if unknown)."""
     current = datetime.today().replace(day=1)
-    for _ in range(12):  # look back up to 12 months
-        baseYr = current.year
-        baseMn = current.month
-        test_params = EXPORT_PARAMS.copy()
-        data = fetch_data(baseYr, baseMn, test_params)
-        if data:
-            return baseYr, baseMn
+    months = []
+    for _ in range(LOOKBACK_MONTHS):
+        months.append(current)
+        if last_good is not None and current <= last_good:
+            break
         current -= relativedelta(months=1)
-        time.sleep(0.5)  # be polite to the server
-    raise Exception("❌ No valid data found for the past 12 months.")
+    return months
+
+def probe_months(months):
+    """Fetch all candidate months concurrently; return the newest (year, month, payload) with data.
+
+    A failed probe for a month newer than the first one with data is an error:
+    we cannot tell whether that month was published.
+    """
+    with ThreadPoolExecutor(max_workers=len(months)) as pool:
+        futures = [pool.submit(fetch_data, m.year, m.month, EXPORT_PARAMS) for m in months]
+        for month, future in zip(months, futures):
+            try:
+                data = future.result()
+            except Exception as e:
+                raise RuntimeError(f"❌ KOTRA probe for {month:%Y-%m} failed: {e}") from e
+            if data:
+                return month.year, month.month, data
+    return None
+
+def get_latest_valid_data():
+    months = candidate_months(load_last_good())
+    found = probe_months(months)
+
+    # The remembered month vanished or regressed: fall back to the full lookback
+    if found is None and len(months) < LOOKBACK_MONTHS:
+        found = probe_months(candidate_months(None)[len(months):])
+    if found is None:
+        raise Exception(f"❌ No valid data found for the past {LOOKBACK_MONTHS} months.")
+    return found
 
 def save_json(data, filepath):
     with open(filepath, "w", encoding="utf-8") as f:
@@ -65,7 +109,7 @@ def save_selected_lists_to_csv(data, export_map, output_dir):
                 cols_to_check = df.columns[1:]
                 df = df.drop(columns=[col for col in cols_to_check if df[col].isna().all() or df[col].eq("").all()])
             save_path = os.path.join(output_dir, filename)
-            df.to_csv(save_path, index=False, encoding="utf-8-sig")
+            landing.write_raw(df, save_path)
             saved.append(save_path)
     return saved
 
@@ -74,14 +118,13 @@ def save_selected_lists_to_csv(data, export_map, output_dir):
 # ---------------------------
 
 if __name__ == "__main__":
-    year, month = get_latest_valid_data()
+    # The winning probe payload is the export data; only imports need another request
+    year, month, export_data = get_latest_valid_data()
     print(f"📦 Fetching latest available data: {year}-{month:02d}")
 
-    EXPORT_PARAMS.update({"baseYr": year, "baseMn": month})
-    IMPORT_PARAMS.update({"baseYr": year, "baseMn": month})
-
-    export_data = fetch_data(year, month, EXPORT_PARAMS)
     import_data = fetch_data(year, month, IMPORT_PARAMS)
+    if import_data is None:
+        raise Exception(f"❌ Import data missing for {year}-{month:02d}.")
 
     # Output directory
     output_dir = os.path.join(data_dir, "trade")
@@ -109,3 +152,5 @@ if __name__ == "__main__":
     print("✅ Exported CSV files:")
     for f in export_files + import_files:
         print(f" - {f}")
+
+    save_last_good(year, month)
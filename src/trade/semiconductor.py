@@ -1,17 +1,20 @@
 import os
-import time
+import sys
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
+from src.utils import downloads
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
     
 # Set your desired download directory
 DOWNLOAD_DIR = os.path.join(data_dir, "trade")
-os.makedirs(os.path.dirname(DOWNLOAD_DIR), exist_ok=True)
+os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
 TARGET_FILENAME = "wsts_billings_latest.xlsx"
 
@@ -35,36 +38,29 @@ def download_latest():
         print("Opening WSTS Historical Billings Report page...")
         driver.get('https://www.wsts.org/67/Historical-Billings-Report')
 
-        # Wait for page to load
-        time.sleep(3)
-
-        # Find and click the Excel download link
-        excel_link = driver.find_element(By.XPATH, "//a[contains(@href, '.xlsx')]")
+        # Wait for the Excel download link
+        excel_link = WebDriverWait(driver, 30).until(
+            EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '.xlsx')]"))
+        )
 
         print(f"Downloading: {excel_link.text}")
+        before = downloads.snapshot(DOWNLOAD_DIR)
         excel_link.click()
 
-        # Wait for the file to download (increase if needed)
-        time.sleep(8)
-
-        # Find the latest downloaded file
-        downloaded_files = sorted(
-            [f for f in os.listdir(DOWNLOAD_DIR) if f.endswith('.xlsx')],
-            key=lambda f: os.path.getmtime(os.path.join(DOWNLOAD_DIR, f))
-        )
-
-        if downloaded_files:
-            latest_file = os.path.join(DOWNLOAD_DIR, downloaded_files[-1])
-            new_file_path = os.path.join(DOWNLOAD_DIR, TARGET_FILENAME)
+        # Returns as soon as the browser has finalised the file
+        latest_file = downloads.wait_for_download(DOWNLOAD_DIR, before, ".xlsx")
+        new_file_path = os.path.join(DOWNLOAD_DIR, TARGET_FILENAME)
 
-            os.rename(latest_file, new_file_path)
+        if downloads.replace_if_changed(latest_file, new_file_path):
             print(f"✓ Renamed downloaded file to: {TARGET_FILENAME}")
-        else:
-            print("No downloaded Excel file found.")
+            return True
+        print(f"WSTS workbook unchanged; keeping existing {TARGET_FILENAME}")
+        return False
 
     finally:
         driver.quit()
         print("Browser closed.")
 
 if __name__ == "__main__":
-    download_latest()
+    if not download_latest():
+        sys.exit(downloads.UNCHANGED_EXIT_CODE)
@@ -1,44 +1,30 @@
-import requests
 import pandas as pd
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from src.utils.ecos import SeriesQuery, fetch_all
+from src.utils import landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 stat_codes = ['901Y011', '901Y012']
 freq = 'M'
 start_period = '202001'
 end_period = datetime.today().strftime('%Y%m')
 
-all_rows = []
-
-for stat_code in stat_codes:
-    # 1. First call to get total count
-    url = f"{base_url}/{api_key}/json/kr/1/100/{stat_code}/{freq}/{start_period}/{end_period}"
-    response = requests.get(url)
-    result = response.json()
-
-    total_count = int(result['StatisticSearch']['list_total_count'])
-    page_count = (total_count // 100) + 1
+# Fetch both stat codes on one session; ECOS pages are requested concurrently
+queries = [SeriesQuery(stat_code, freq, start_period, end_period) for stat_code in stat_codes]
+results = fetch_all(queries, api_key=api_key)
 
-    # 2. Loop over pages
-    for i in range(page_count):
-        start = str(i * 100 + 1)
-        end = str((i + 1) * 100)
-        page_url = f"{base_url}/{api_key}/json/kr/{start}/{end}/{stat_code}/{freq}/{start_period}/{end_period}"
-        page_response = requests.get(page_url)
-        page_data = page_response.json()
-
-        rows = page_data.get('StatisticSearch', {}).get('row', [])
-        for row in rows:
-            row['STAT_CODE'] = stat_code
-        all_rows.extend(rows)
+all_rows = []
+for stat_code, rows in zip(stat_codes, results):
+    for row in rows:
+        row['STAT_CODE'] = stat_code
+    all_rows.extend(rows)
 
-# 3. Convert to DataFrame
+# Convert to DataFrame
 df = pd.DataFrame(all_rows)
 df['datetime'] = pd.to_datetime(df['TIME'].str[:4] + '-' + df['TIME'].str[4:], errors='coerce')
 df.drop_duplicates(inplace=True)
@@ -85,6 +71,6 @@ df_filtered.drop(columns=cols_to_drop, inplace=True, errors='ignore')
 output_dir = os.path.join(data_dir, "trade")
 os.makedirs(os.path.dirname(output_dir), exist_ok=True)
 save_path = os.path.join(output_dir, "korea_trade_yoy.csv")
-df_filtered.to_csv(save_path, index=False, encoding='utf-8-sig')
+landing.write_raw(df_filtered, save_path)
 print(f"✅ Saved filtered trade data to: {save_path}")
 
@@ -1,26 +1,24 @@
-import requests
 import pandas as pd
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from src.utils.ecos import SeriesQuery, fetch_all
+from src.utils import landing
 
 load_dotenv()
 data_dir = os.getenv("DATA_DIR")
 
 api_key = os.getenv('ECOS_API_KEY')
-base_url = 'https://ecos.bok.or.kr/api/StatisticSearch'
 stat_codes = ['403Y001', '403Y003']  # Export & Import Price Index
 freq = 'M'
 start_period = '202201'
 end_period = datetime.today().strftime('%Y%m')
 
-all_rows = []
+queries = [SeriesQuery(stat_code, freq, start_period, end_period) for stat_code in stat_codes]
+results = fetch_all(queries, api_key=api_key)
 
-for stat_code in stat_codes:
-    url = f"{base_url}/{api_key}/json/kr/1/10000/{stat_code}/{freq}/{start_period}/{end_period}"
-    response = requests.get(url)
-    data = response.json()
-    rows = data.get('StatisticSearch', {}).get('row', [])
+all_rows = []
+for stat_code, rows in zip(stat_codes, results):
     for row in rows:
         row['STAT_CODE'] = stat_code
     all_rows.extend(rows)
@@ -87,5 +85,5 @@ output_dir = os.path.join(data_dir, "trade")
 os.makedirs(os.path.dirname(output_dir), exist_ok=True)
 save_path = os.path.join(output_dir, "korea_trade_items_yoy.csv")
 
-df_filtered.to_csv(save_path, index=False, encoding='utf-8-sig')
+landing.write_raw(df_filtered, save_path)
 print(f"✅ Saved to {save_path}")
\ No newline at end of file
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import time
+
+# Browsers write to a temp name and rename it once the transfer completes
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".tmp")
+
+# Exit code a collector uses to say "downloaded, but identical to what we already had";
+# src.collect treats it as success and skips the collector's dependents
+UNCHANGED_EXIT_CODE = 3
+
+
+def snapshot(directory):
+    """``{name: mtime}`` of the files in ``directory``, taken just before triggering a download."""
+    if not os.path.isdir(directory):
+        return {}
+    return {entry.name: entry.stat().st_mtime for entry in os.scandir(directory) if entry.is_file()}
+
+
+def _partials(directory):
+    return [f for f in os.listdir(directory) if f.endswith(PARTIAL_SUFFIXES)]
+
+
+def wait_for_download(directory, before, suffix, timeout=180, poll=0.25, stable_polls=2):
+    """Block until a new ``suffix`` file appears in ``directory`` and is finished.
+
+    A file counts as finished once no partial download is left in the
+    directory and its size is non-zero and unchanged for ``stable_polls``
+    consecutive polls. Returns the file's path; raises ``TimeoutError``.
+    """
+    deadline = time.monotonic() + timeout
+    last_size, stable = None, 0
+
+    while time.monotonic() < deadline:
+        candidates = [
+            entry for entry in os.scandir(directory)
+            if entry.is_file() and entry.name.endswith(suffix)
+            and before.get(entry.name) != entry.stat().st_mtime
+        ]
+        if candidates and not _partials(directory):
+            newest = max(candidates, key=lambda entry: entry.stat().st_mtime)
+            size = newest.stat().st_size
+            stable = stable + 1 if size and size == last_size else 0
+            last_size = size
+            if stable >= stable_polls:
+                return newest.path
+        time.sleep(poll)
+
+    raise TimeoutError(f"No completed {suffix} download in {directory} after {timeout}s")
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def replace_if_changed(downloaded, target):
+    """Move ``downloaded`` onto ``target`` unless the content is identical.
+
+    Returns True when ``target`` was updated. An identical download is
+    deleted so the directory does not collect duplicates.
+    """
+    if os.path.abspath(downloaded) == os.path.abspath(target):
+        return True
+    if os.path.exists(target) and file_digest(downloaded) == file_digest(target):
+        os.remove(downloaded)
+        return False
+    os.replace(downloaded, target)
+    return True
@@ -0,0 +1,103 @@
+import asyncio
+import os
+from typing import NamedTuple, Sequence
+
+import aiohttp
+from dotenv import load_dotenv
+
+from src.utils import http_cache
+
+load_dotenv()
+
+BASE_URL = 'https://ecos.bok.or.kr/api/StatisticSearch'
+PAGE_SIZE = 1000
+MAX_CONCURRENCY = 8
+TIMEOUT = 30
+
+# ECOS answers "no rows for this query" with an INFO code instead of an empty list
+NO_DATA_CODE = 'INFO-200'
+
+
+class EcosError(Exception):
+    """Raised when ECOS returns an error result instead of rows."""
+
+
+class SeriesQuery(NamedTuple):
+    stat_code: str
+    freq: str
+    start: str
+    end: str
+    item_codes: Sequence[str] = ()
+
+
+class EcosClient:
+    """Async ECOS client sharing one keep-alive session across all requests.
+
+    Use as ``async with EcosClient() as client: rows = await client.fetch_series(...)``.
+    """
+
+    def __init__(self, api_key=None, page_size=PAGE_SIZE, max_concurrency=MAX_CONCURRENCY, timeout=TIMEOUT):
+        self.api_key = api_key or os.getenv('ECOS_API_KEY')
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    def _url(self, first: int, last: int, query: SeriesQuery) -> str:
+        parts = [BASE_URL, self.api_key, 'json', 'kr', str(first), str(last),
+                 query.stat_code, query.freq, query.start, query.end, *query.item_codes]
+        return '/'.join(parts)
+
+    async def _get_page(self, first: int, last: int, query: SeriesQuery) -> tuple[int, list[dict]]:
+        """Fetch rows ``first``..``last`` and return ``(list_total_count, rows)``."""
+        async with self._semaphore:
+            response = await http_cache.aget(self._session, self._url(first, last, query))
+        response.raise_for_status()
+        data = response.json()
+
+        if 'StatisticSearch' not in data:
+            result = data.get('RESULT', {})
+            if result.get('CODE') == NO_DATA_CODE:
+                return 0, []
+            raise EcosError(f"{query.stat_code}: {result.get('CODE')} {result.get('MESSAGE')}")
+
+        body = data['StatisticSearch']
+        return int(body.get('list_total_count', 0)), body.get('row', [])
+
+    async def fetch_series(self, stat_code: str, freq: str, start: str, end: str,
+                           item_codes: Sequence[str] = ()) -> list[dict]:
+        """Fetch every row of one series, requesting the remaining pages concurrently."""
+        query = SeriesQuery(stat_code, freq, start, end, tuple(item_codes))
+        total, rows = await self._get_page(1, self.page_size, query)
+
+        # The first page tells us the total; fetch the rest in parallel
+        page_starts = range(self.page_size + 1, total + 1, self.page_size)
+        pages = await asyncio.gather(*(
+            self._get_page(first, first + self.page_size - 1, query) for first in page_starts
+        ))
+        for _, page_rows in pages:
+            rows.extend(page_rows)
+        return rows
+
+    async def fetch_many(self, queries: Sequence[SeriesQuery]) -> list[list[dict]]:
+        """Fetch several series concurrently, returning rows in query order."""
+        return await asyncio.gather(*(self.fetch_series(*query) for query in queries))
+
+
+def fetch_all(queries: Sequence[SeriesQuery], **client_kwargs) -> list[list[dict]]:
+    """Blocking helper for collector scripts: fetch ``queries`` on one pooled session."""
+    async def _run():
+        async with EcosClient(**client_kwargs) as client:
+            return await client.fetch_many(queries)
+
+    return asyncio.run(_run())
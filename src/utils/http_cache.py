@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from dotenv import load_dotenv
+
+from src.utils import resilience
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR") or os.path.join(DATA_DIR or ".", ".cache", "http")
+DEFAULT_TTL = int(os.getenv("HTTP_CACHE_TTL", 12 * 3600))  # seconds
+TIMEOUT = 60
+
+# default: serve fresh cache hits, fetch and store misses
+# replay:  serve only from the cache (stale entries included), never touch the network
+# refresh: always fetch, then overwrite the cache
+MODE = "replay" if "--replay" in sys.argv else os.getenv("HTTP_CACHE_MODE", "default")
+
+
+# Query parameters whose values are credentials (DAPA serviceKey, apiKey, access_token, ...)
+SECRET_PARAM = re.compile(r"key|token|secret|password|auth", re.IGNORECASE)
+REDACTED = "***"
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class CachedResponse:
+    """Minimal ``requests.Response`` stand-in returned for both cache hits and fresh fetches."""
+
+    def __init__(self, url, status_code, content, headers=None, encoding=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 300
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def cache_key(method, url, params=None):
+    """Hash of method + URL + sorted params; headers (API keys, user agents) are not part of the key."""
+    canonical = json.dumps(
+        {"method": method.upper(), "url": url, "params": sorted((str(k), str(v)) for k, v in (params or {}).items())},
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _secret_values():
+    """Credential values from the environment (``*_KEY``, ``*_TOKEN``, ...), e.g. the ECOS key in its URL path."""
+    return {value for name, value in os.environ.items() if SECRET_PARAM.search(name) and len(value) >= 8}
+
+
+def redact_params(params):
+    secrets = _secret_values()
+    return {str(k): REDACTED if SECRET_PARAM.search(str(k)) or str(v) in secrets else str(v)
+            for k, v in (params or {}).items()}
+
+
+def redact_url(url):
+    """``url`` with credential query values and path segments replaced by ``***``."""
+    secrets = _secret_values()
+    parts = urlsplit(url)
+    path = "/".join(REDACTED if segment in secrets else segment for segment in parts.path.split("/"))
+    query = urlencode(list(redact_params(dict(parse_qsl(parts.query, keep_blank_values=True))).items()), safe="*")
+    return urlunsplit((parts.scheme, parts.netloc, path, query, parts.fragment))
+
+
+def _meta_path(key):
+    return os.path.join(CACHE_DIR, "requests", key[:2], f"{key}.json")
+
+
+def _blob_path(digest):
+    return os.path.join(CACHE_DIR, "blobs", digest[:2], digest)
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load(key, ttl=DEFAULT_TTL):
+    """Return the cached response for ``key``, or None if missing or older than ``ttl``."""
+    meta_path = _meta_path(key)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if MODE != "replay" and time.time() - meta["fetched_at"] > ttl:
+        return None
+
+    blob_path = _blob_path(meta["digest"])
+    if not os.path.exists(blob_path):
+        return None
+    with open(blob_path, "rb") as f:
+        content = f.read()
+    return CachedResponse(meta["url"], meta["status_code"], content, meta["headers"], meta["encoding"], from_cache=True)
+
+
+def store(key, response, params=None, cache_if=None):
+    """Persist a successful response; bodies are stored once per content hash.
+
+    ``cache_if(response)`` can veto storing, e.g. for "not published yet"
+    bodies that should be re-asked on the next run rather than for the TTL.
+    Credentials are redacted from the stored URL and params.
+    """
+    if not response.ok or (cache_if is not None and not cache_if(response)):
+        return
+    digest = hashlib.sha256(response.content).hexdigest()
+    blob_path = _blob_path(digest)
+    if not os.path.exists(blob_path):
+        _atomic_write(blob_path, response.content)
+
+    meta = {
+        "url": redact_url(response.url),
+        "params": redact_params(params),
+        "status_code": response.status_code,
+        "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        "encoding": response.encoding,
+        "digest": digest,
+        "fetched_at": time.time(),
+    }
+    _atomic_write(_meta_path(key), json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def _lookup(key, url, ttl, cache_if=None):
+    if MODE == "refresh":
+        return None
+    cached = load(key, ttl)
+    if cached is not None and MODE != "replay" and cache_if is not None and not cache_if(cached):
+        cached = None  # stored before the caller declared it uncacheable
+    if cached is None and MODE == "replay":
+        raise CacheMiss(f"No cached response for {redact_url(url)}")
+    return cached
+
+
+def get(url, params=None, headers=None, session=None, ttl=DEFAULT_TTL, timeout=TIMEOUT, cache_if=None):
+    """Cached drop-in for ``requests.get`` / ``session.get``; see ``store`` for ``cache_if``."""
+    key = cache_key("GET", url, params)
+    cached = _lookup(key, url, ttl, cache_if)
+    if cached is not None:
+        return cached
+
+    def send():
+        response = (session or requests).get(url, params=params, headers=headers, timeout=timeout)
+        return CachedResponse(response.url, response.status_code, response.content,
+                              dict(response.headers), response.encoding)
+
+    result = resilience.call(url, send)
+    store(key, result, params, cache_if)
+    return result
+
+
+async def aget(session, url, params=None, headers=None, ttl=DEFAULT_TTL, limiter=None, cache_if=None):
+    """Cached GET on an ``aiohttp.ClientSession``.
+
+    ``limiter`` (e.g. a ``TokenBucket``) is only acquired when the request
+    actually goes to the network, so cache hits are never throttled. Network
+    requests, in both ``get`` and ``aget``, go through ``resilience`` for
+    per-host limits, retries and circuit breaking.
+    """
+    key = cache_key("GET", url, params)
+    cached = _lookup(key, url, ttl, cache_if)
+    if cached is not None:
+        return cached
+
+    async def send():
+        if limiter is not None:
+            await limiter.acquire()
+        async with session.get(url, params=params, headers=headers) as response:
+            content = await response.read()
+            return CachedResponse(str(response.url), response.status, content,
+                                  dict(response.headers), response.charset)
+
+    result = await resilience.acall(url, send)
+    store(key, result, params, cache_if)
+    return result
@@ -0,0 +1,225 @@
+"""Raw landing zone.
+
+Collectors hand their raw frames to ``write_raw`` instead of writing
+``utf-8-sig`` CSVs. Each write lands as typed Parquet under
+
+    DATA_DIR/raw/sector=<sector>/source=<source>/ingest_date=YYYY-MM-DD/part-0.parquet
+
+where sector/source come from the CSV path the collector used to write
+(``DATA_DIR/<sector>/<source>.csv``). Rewrites on the same day replace that
+day's partition. The CSV is still written next to it as a human-readable
+mirror unless ``RAW_CSV_MIRROR=0``.
+"""
+import glob
+import os
+import re
+import shutil
+import tempfile
+import threading
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+RAW_DIR = os.getenv("RAW_DIR") or os.path.join(DATA_DIR or ".", "raw")
+CSV_MIRROR = os.getenv("RAW_CSV_MIRROR", "1") != "0"
+
+# Digit strings with a leading zero are codes (ITEM_CODE1 = "0000001"), not numbers
+_CODE_PATTERN = re.compile(r"^[+-]?0\d")
+# Literals read_csv parses as booleans
+_BOOLEANS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+
+def _blank_to_na(series):
+    """Empty or whitespace-only cells are missing values, as ``read_csv`` sees them."""
+    return series.replace(r"^\s*$", None, regex=True)
+
+
+def locate(csv_path):
+    """``(sector, source)`` for a collector CSV path ``DATA_DIR/<sector>/<source>.csv``."""
+    sector = os.path.basename(os.path.dirname(os.path.abspath(csv_path)))
+    source = os.path.splitext(os.path.basename(csv_path))[0]
+    return sector, source
+
+
+def partition_dir(sector, source, ingest_date):
+    return os.path.join(RAW_DIR, f"sector={sector}", f"source={source}", f"ingest_date={ingest_date}")
+
+
+def _typed(df):
+    """Give text columns the types ``pd.read_csv`` would infer, so readers get the same frame without parsing.
+
+    Blank cells are missing values first, so ``["1", "", "3"]`` becomes float
+    like it does in the CSV mirror, and True/False literals become booleans.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        series = _blank_to_na(series)
+        present = series.dropna()
+        text = present.astype(str)
+        numeric = pd.to_numeric(text.str.strip(), errors="coerce")
+        if len(present) and text.isin(_BOOLEANS).all():
+            # Without gaps read_csv gives bool; with gaps an object column of True/False/NaN
+            booleans = series.map(lambda v: _BOOLEANS.get(str(v)) if pd.notna(v) else None)
+            df[col] = booleans.astype(bool) if booleans.notna().all() else booleans.astype("boolean")
+        elif len(present) and numeric.notna().all() and not text.str.match(_CODE_PATTERN).any():
+            df[col] = pd.to_numeric(series, errors="coerce")
+        else:
+            # Mixed JSON payloads (numbers next to "Net Exporter") become one text column
+            df[col] = series.where(series.isna(), series.astype(str))
+    return df
+
+
+def write_raw(df, csv_path, ingest_date=None, mirror=CSV_MIRROR):
+    """Land ``df`` as today's Parquet partition for ``csv_path``; returns the Parquet path."""
+    sector, source = locate(csv_path)
+    ingest_date = ingest_date or date.today().isoformat()
+    out_dir = partition_dir(sector, source, ingest_date)
+    os.makedirs(out_dir, exist_ok=True)
+
+    path = os.path.join(out_dir, "part-0.parquet")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    _typed(df).to_parquet(tmp_path, index=False, engine="pyarrow", compression="zstd")
+    os.replace(tmp_path, path)
+
+    if mirror:
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    return path
+
+
+class PageWriter:
+    """Land a paged source without holding it in memory.
+
+    Each ``write(rows)`` stores one page (a list of dicts or a DataFrame) as a
+    temporary Parquet part. ``close()`` takes the union of every page's
+    columns, infers each column's type over all pages the way ``_typed``
+    does, then streams the parts into today's partition and the CSV mirror.
+    Only one page is in memory at any point. ``abort()`` discards the pages
+    and keeps the previous landing.
+    """
+
+    def __init__(self, csv_path, ingest_date=None, mirror=CSV_MIRROR):
+        self.csv_path = csv_path
+        self.ingest_date = ingest_date or date.today().isoformat()
+        self.mirror = mirror
+        self.rows = 0
+        self._parts = []
+        self._columns = {}   # name -> [non-null count, kind]; kind is "bool", "int", "float" or "text"
+        os.makedirs(RAW_DIR, exist_ok=True)
+        self._tmp_dir = tempfile.mkdtemp(prefix=".pages-", dir=RAW_DIR)
+
+    def write(self, rows):
+        page = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if page.empty:
+            return
+        page = page.apply(_blank_to_na)
+        for col in page.columns:
+            present = page[col].dropna().astype(str)
+            stats = self._columns.setdefault(col, [0, None])
+            stats[0] += len(present)
+            if not len(present) or stats[1] == "text":
+                continue
+            numeric = pd.to_numeric(present.str.strip(), errors="coerce")
+            if present.isin(_BOOLEANS).all():
+                kind = "bool"
+            elif numeric.isna().any() or present.str.match(_CODE_PATTERN).any():
+                kind = "text"
+            else:
+                kind = "int" if pd.api.types.is_integer_dtype(numeric) else "float"
+            if stats[1] is None or stats[1] == kind:
+                stats[1] = kind
+            elif {stats[1], kind} == {"int", "float"}:
+                stats[1] = "float"
+            else:
+                stats[1] = "text"
+
+        path = os.path.join(self._tmp_dir, f"page-{len(self._parts):05d}.parquet")
+        text = page.astype(object).where(page.notna(), None).map(lambda v: v if v is None else str(v))
+        pq.write_table(pa.Table.from_pandas(text, schema=pa.schema([(col, pa.string()) for col in page.columns]),
+                                            preserve_index=False), path)
+        self._parts.append(path)
+        self.rows += len(page)
+
+    def _schema(self):
+        fields = []
+        for col, (count, kind) in self._columns.items():
+            if kind == "bool":
+                fields.append(pa.field(col, pa.bool_()))
+            elif kind == "int" and count == self.rows:
+                fields.append(pa.field(col, pa.int64()))
+            elif kind in ("int", "float"):
+                # Missing values (or pages without the column) make integer columns float, as in read_csv
+                fields.append(pa.field(col, pa.float64()))
+            else:
+                fields.append(pa.field(col, pa.string()))
+        return pa.schema(fields)
+
+    def close(self):
+        """Write the partition (and CSV mirror) and return the Parquet path."""
+        try:
+            schema = self._schema()
+            columns = schema.names
+            out_dir = partition_dir(*locate(self.csv_path), self.ingest_date)
+            os.makedirs(out_dir, exist_ok=True)
+            path = os.path.join(out_dir, "part-0.parquet")
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            csv_tmp = f"{self.csv_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            if self.mirror:
+                os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
+
+            with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+                for i, part in enumerate(self._parts):
+                    # Columns this page lacks come back all-NaN (float); keep every column as text until typed
+                    page = pd.read_parquet(part).reindex(columns=columns).astype("string")
+                    typed = {}
+                    for field in schema:
+                        values = page[field.name]
+                        if pa.types.is_boolean(field.type):
+                            values = values.map(_BOOLEANS).astype("boolean")
+                        elif pa.types.is_floating(field.type) or pa.types.is_integer(field.type):
+                            values = pd.to_numeric(values.str.strip(), errors="coerce")
+                        typed[field.name] = values
+                    writer.write_table(pa.Table.from_pandas(pd.DataFrame(typed), schema=schema, preserve_index=False))
+                    if self.mirror:
+                        page.to_csv(csv_tmp, mode="w" if i == 0 else "a", header=i == 0, index=False,
+                                    encoding="utf-8-sig" if i == 0 else "utf-8")
+
+            os.replace(tmp_path, path)
+            if self.mirror:
+                os.replace(csv_tmp, self.csv_path)
+            return path
+        finally:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def abort(self):
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+def latest_partition(csv_path):
+    """Parquet file of the newest ingest for ``csv_path``, or None if it was never landed."""
+    sector, source = locate(csv_path)
+    paths = sorted(glob.glob(os.path.join(partition_dir(sector, source, "*"), "part-0.parquet")))
+    return paths[-1] if paths else None
+
+
+def exists(csv_path):
+    return latest_partition(csv_path) is not None or os.path.exists(csv_path)
+
+
+def read_latest(csv_path, **csv_kwargs):
+    """Newest landed frame for ``csv_path``; falls back to the CSV for data collected before the landing zone."""
+    path = latest_partition(csv_path)
+    if path is not None:
+        return pd.read_parquet(path)
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path, encoding="utf-8-sig", **csv_kwargs)
+    return None
@@ -0,0 +1,290 @@
+"""Shared request policy for every collector that goes through ``http_cache``.
+
+Per upstream host it provides:
+
+* one concurrency limit shared by threads and asyncio tasks (on any event loop),
+* retries with full-jitter exponential backoff that honours ``Retry-After``,
+* a circuit breaker that fails fast once calls to the host keep failing
+  (one count per call after its retries; throttling does not count),
+* latency / error / retry counters, logged and appended to
+  ``DATA_DIR/.state/metrics/requests.jsonl`` when the process exits.
+
+Limits can be tuned per host with ``configure(host, ...)``; defaults come
+from ``HOST_CONCURRENCY``, ``HTTP_MAX_RETRIES`` and ``CIRCUIT_FAILURES``.
+"""
+import asyncio
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+METRICS_PATH = os.path.join(DATA_DIR or ".", ".state", "metrics", "requests.jsonl")
+MAX_CONCURRENCY = int(os.getenv("HOST_CONCURRENCY", 8))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 4))
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURES", 5))
+RESET_TIMEOUT = 60  # seconds an open circuit waits before letting a probe through
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+SLOT_POLL = 0.02  # seconds an asyncio task waits between tries for a busy host slot
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class CircuitOpen(Exception):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def retry_after_seconds(headers):
+    """Seconds requested by a ``Retry-After`` header (delta or HTTP date), or None."""
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential delay for ``attempt`` (0-based); ``Retry-After`` wins when given."""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_CAP * 4)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Closed → open after ``threshold`` consecutive failures → half-open probe after ``reset_timeout``."""
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def check(self, host):
+        with self._lock:
+            state = self.state
+            if state == "open":
+                raise CircuitOpen(f"Circuit open for {host} after {self.failures} consecutive failures")
+            if state == "half-open":
+                # Let this request through as the probe; everyone else keeps failing fast
+                self.opened_at = time.monotonic()
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures, self.opened_at = 0, None
+                return
+            self.failures += 1
+            # A failed half-open probe re-opens the circuit for another full timeout
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class HostSlots:
+    """Concurrency limit for one host, usable as ``with`` from threads and ``async with`` from tasks.
+
+    Both go through the same semaphore, so the limit holds across threads and
+    every event loop in the process. Tasks poll for a free slot instead of
+    blocking their loop.
+    """
+
+    def __init__(self, limit):
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(SLOT_POLL)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self.latencies.append(seconds)
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3) if latencies else None
+
+        return {"requests": self.requests, "errors": self.errors, "retries": self.retries,
+                "rejected": self.rejected, "p50_s": pct(0.5), "p95_s": pct(0.95), "max_s": pct(1.0)}
+
+
+class HostPolicy:
+    def __init__(self, host, max_concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES,
+                 failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.host = host
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.metrics = HostMetrics()
+        self.slots = HostSlots(max_concurrency)
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def policy_for(url_or_host):
+    host = urlsplit(url_or_host).netloc or url_or_host
+    with _policies_lock:
+        if host not in _policies:
+            _policies[host] = HostPolicy(host)
+        return _policies[host]
+
+
+def configure(host, **settings):
+    """Override the policy for ``host`` (``max_concurrency``, ``max_retries``, ``failure_threshold``, ...)."""
+    with _policies_lock:
+        _policies[host] = HostPolicy(host, **settings)
+    return _policies[host]
+
+
+def _outcome(response, error):
+    """``(ok, should_retry, retry_after)`` for one attempt.
+
+    ``ok`` is None when the host is throttling (429, or a retryable status with
+    ``Retry-After``): the host is up, so the breaker should not count it.
+    """
+    if error is not None:
+        return False, True, None
+    if response.status_code in RETRY_STATUSES:
+        retry_after = retry_after_seconds(response.headers)
+        throttled = response.status_code == 429 or retry_after is not None
+        return (None if throttled else False), True, retry_after
+    return True, False, None
+
+
+def _check(policy):
+    try:
+        policy.breaker.check(policy.host)
+    except CircuitOpen:
+        policy.metrics.count("rejected")
+        raise
+
+
+def call(url, send):
+    """Run ``send()`` (returning a response with ``status_code``/``headers``) under the host policy."""
+    policy = policy_for(url)
+    _check(policy)
+    for attempt in range(policy.max_retries + 1):
+        response, error = None, None
+        with policy.slots:
+            started = time.perf_counter()
+            try:
+                response = send()
+            except RETRY_EXCEPTIONS as e:
+                error = e
+        ok, retry, retry_after = _outcome(response, error)
+        policy.metrics.record(time.perf_counter() - started, ok is True)
+
+        if not retry or attempt == policy.max_retries:
+            break
+        policy.metrics.count("retries")
+        time.sleep(backoff_delay(attempt, retry_after))
+
+    # One breaker count per call, once its retries are spent
+    if ok is not None:
+        policy.breaker.record(ok)
+    if error is not None:
+        raise error
+    return response
+
+
+async def acall(url, send):
+    """Async twin of ``call``; ``send`` is a coroutine function."""
+    policy = policy_for(url)
+    _check(policy)
+    for attempt in range(policy.max_retries + 1):
+        response, error = None, None
+        async with policy.slots:
+            started = time.perf_counter()
+            try:
+                response = await send()
+            except RETRY_EXCEPTIONS as e:
+                error = e
+        ok, retry, retry_after = _outcome(response, error)
+        policy.metrics.record(time.perf_counter() - started, ok is True)
+
+        if not retry or attempt == policy.max_retries:
+            break
+        policy.metrics.count("retries")
+        await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+    # One breaker count per call, once its retries are spent
+    if ok is not None:
+        policy.breaker.record(ok)
+    if error is not None:
+        raise error
+    return response
+
+
+def metrics():
+    """``{host: summary}`` for every host contacted by this process."""
+    return {host: policy.metrics.summary() for host, policy in _policies.items() if policy.metrics.requests}
+
+
+@atexit.register
+def _emit_metrics():
+    summaries = metrics()
+    if not summaries:
+        return
+    for host, summary in summaries.items():
+        print(f"📊 {host}: {summary}")
+
+    os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+    source = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "interactive"
+    with open(METRICS_PATH, "a", encoding="utf-8") as f:
+        for host, summary in summaries.items():
+            f.write(json.dumps({"ts": time.time(), "source": source, "host": host, **summary}) + "\n")
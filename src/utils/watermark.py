@@ -0,0 +1,98 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+from dotenv import load_dotenv
+from src.utils import landing
+
+load_dotenv()
+DATA_DIR = os.getenv("DATA_DIR")
+
+STATE_PATH = os.path.join(DATA_DIR or ".", ".state", "ecos_watermarks.json")
+
+# Periods re-requested behind the watermark so ECOS revisions are picked up
+REVISION_OVERLAP = {'A': 1, 'Q': 2, 'M': 3, 'D': 14}
+
+
+def shift_period(period: str, freq: str, n: int) -> str:
+    """Move an ECOS ``TIME`` string ``n`` periods back (A=YYYY, Q=YYYYQn, M=YYYYMM, D=YYYYMMDD)."""
+    if freq == 'A':
+        return str(int(period) - n)
+    if freq == 'Q':
+        p = pd.Period(f"{period[:4]}Q{period[-1]}", freq='Q') - n
+        return f"{p.year}Q{p.quarter}"
+    if freq == 'M':
+        p = pd.Period(f"{period[:4]}-{period[4:6]}", freq='M') - n
+        return p.strftime('%Y%m')
+    if freq == 'D':
+        return (datetime.strptime(period, '%Y%m%d') - timedelta(days=n)).strftime('%Y%m%d')
+    raise ValueError(f"Unsupported ECOS frequency: {freq}")
+
+
+class WatermarkStore:
+    """Last ``TIME`` fetched per (stat_code, item_code), persisted as JSON."""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self.marks = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.marks = json.load(f)
+
+    @staticmethod
+    def key(stat_code, item_code):
+        return f"{stat_code}/{item_code}"
+
+    def get(self, stat_code, item_code):
+        return self.marks.get(self.key(stat_code, item_code))
+
+    def start_period(self, stat_code, freq, default_start, item_codes=(), overlap=None):
+        """First period to request: the watermark minus the revision overlap.
+
+        Without ``item_codes`` the whole stat code is requested, so the oldest
+        watermark across its items is used. Falls back to ``default_start``
+        when nothing has been recorded yet.
+        """
+        if item_codes:
+            marks = [self.get(stat_code, item_codes[0])]
+        else:
+            prefix = f"{stat_code}/"
+            marks = [v for k, v in self.marks.items() if k.startswith(prefix)]
+        marks = [m for m in marks if m]
+        if not marks:
+            return default_start
+
+        overlap = REVISION_OVERLAP.get(freq, 1) if overlap is None else overlap
+        start = shift_period(min(marks), freq, overlap)
+        return max(start, default_start)
+
+    def update(self, stat_code, rows):
+        """Advance the watermark of every ``ITEM_CODE1`` seen in ``rows``."""
+        for row in rows:
+            key = self.key(stat_code, row.get('ITEM_CODE1'))
+            time = str(row['TIME'])
+            if key not in self.marks or time > self.marks[key]:
+                self.marks[key] = time
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.marks, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def merge_into_csv(df, path, keys, date_cols=()):
+    """Merge freshly fetched rows into the existing raw data, newer rows winning on ``keys``."""
+    str_keys = {k: str for k in keys if k not in date_cols}
+    existing = landing.read_latest(path, dtype=str_keys)
+    if existing is None:
+        return df
+
+    existing = existing.astype(str_keys)
+    for col in date_cols:
+        existing[col] = pd.to_datetime(existing[col])
+    df = df.astype(str_keys)
+    merged = pd.concat([existing, df], ignore_index=True)
+    return merged.drop_duplicates(subset=list(keys), keep='last')
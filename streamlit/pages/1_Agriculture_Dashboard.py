@@ -883,7 +883,7 @@ if not yoy_data.empty and 'commodity' in yoy_data.columns:
     # Show YoY statistics for selected commodities with insights
     if len(yoy_data['commodity'].unique()) > 1:
         st.subheader("📊 YoY Volatility Analysis")
-        yoy_stats = yoy_data.groupby('commodity')['yoy_change'].agg(['mean', 'std', 'min', 'max']).round(2)
+        yoy_stats = yoy_data.groupby('commodity', observed=True)['yoy_change'].agg(['mean', 'std', 'min', 'max']).round(2)
         yoy_stats.columns = ['Average YoY (%)', 'Volatility (Std Dev)', 'Worst YoY (%)', 'Best YoY (%)']
         
         # Add volatility assessment
@@ -810,7 +810,7 @@ if not combined_analysis.empty and 'category' in combined_analysis.columns:
         st.subheader("📊 Category Statistics")
         
         # Enhanced category stats table with both count and value metrics
-        category_stats = combined_analysis.groupby('category').agg({
+        category_stats = combined_analysis.groupby('category', observed=True).agg({
             'value': ['count', 'sum', 'mean']
         }).round(2)
         category_stats.columns = ['Count', 'Total Value', 'Average Value']
@@ -842,7 +842,7 @@ if not combined_analysis.empty:
     else:  # Yearly
         combined_analysis['time_period'] = combined_analysis['date'].dt.to_period('Y')
     
-    time_series = combined_analysis.groupby('time_period').agg({
+    time_series = combined_analysis.groupby('time_period', observed=True).agg({
         'value': ['sum', 'count', 'mean'],
         'date': 'min'
     }).reset_index()
@@ -678,7 +678,7 @@ def detect_economic_signals(economic_data, fx_data, sentiment_data):
     # Sentiment Analysis
     if not sentiment_data.empty and 'indicator' in sentiment_data.columns:
         # Get latest sentiment values
-        latest_sentiment = sentiment_data.groupby('indicator')['value'].last()
+        latest_sentiment = sentiment_data.groupby('indicator', observed=True)['value'].last()
         
         if not latest_sentiment.empty:
             avg_sentiment = latest_sentiment.mean()
@@ -923,7 +923,7 @@ st.markdown('<div class="section-header"><h2>💱 Foreign Exchange Analysis</h2>
 if not fx_raw.empty and 'pair' in fx_raw.columns:
     # Normalize FX rates for better comparison
     fx_norm = fx_raw.copy()
-    fx_norm['normalized'] = fx_norm.groupby('pair')['exchange_rate'].transform(lambda x: x / x.iloc[0])
+    fx_norm['normalized'] = fx_norm.groupby('pair', observed=True)['exchange_rate'].transform(lambda x: x / x.iloc[0])
     
     # FX rates over time (normalized)
     fig_fx = px.line(
@@ -943,13 +943,13 @@ if not fx_raw.empty and 'pair' in fx_raw.columns:
     # FX statistics
     if len(fx_raw['pair'].unique()) > 1:
         st.subheader("📊 FX Statistics by Currency Pair")
-        fx_stats = fx_raw.groupby('pair')['exchange_rate'].agg(['mean', 'std', 'min', 'max']).round(4)
+        fx_stats = fx_raw.groupby('pair', observed=True)['exchange_rate'].agg(['mean', 'std', 'min', 'max']).round(4)
         fx_stats.columns = ['Average Rate', 'Std Dev', 'Min Rate', 'Max Rate']
         st.dataframe(fx_stats, use_container_width=True)
         
         # Latest FX rates
         st.subheader("📈 Latest Exchange Rates")
-        latest_fx = fx_raw.groupby('pair')['exchange_rate'].last().round(4)
+        latest_fx = fx_raw.groupby('pair', observed=True)['exchange_rate'].last().round(4)
         latest_fx_df = pd.DataFrame({
             'Currency Pair': latest_fx.index,
             'Latest Rate': latest_fx.values
@@ -1023,7 +1023,7 @@ if not sentiment_raw.empty and 'indicator' in sentiment_raw.columns:
     # Sentiment statistics
     if len(sentiment_raw['indicator'].unique()) > 1:
         st.subheader("📊 Sentiment Statistics by Indicator")
-        sentiment_stats = sentiment_raw.groupby('indicator')['value'].agg(['mean', 'std', 'min', 'max']).round(2)
+        sentiment_stats = sentiment_raw.groupby('indicator', observed=True)['value'].agg(['mean', 'std', 'min', 'max']).round(2)
         sentiment_stats.columns = ['Average Index', 'Std Dev', 'Min Index', 'Max Index']
         st.dataframe(sentiment_stats, use_container_width=True)
     
@@ -1050,7 +1050,7 @@ if not sentiment_raw.empty and 'indicator' in sentiment_raw.columns:
         st.plotly_chart(fig_strength, use_container_width=True)
         
         # Latest sentiment strength by indicator
-        latest_sentiment_strength = sentiment_processed.groupby('indicator')['sentiment_strength'].last()
+        latest_sentiment_strength = sentiment_processed.groupby('indicator', observed=True)['sentiment_strength'].last()
         st.subheader("📈 Latest Sentiment Strength by Indicator")
         st.dataframe(latest_sentiment_strength.reset_index(), use_container_width=True)
 else:
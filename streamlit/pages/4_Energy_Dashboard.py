@@ -551,7 +551,7 @@ def detect_energy_signals(iea_stocks_data, oil_imports_data, import_price_data):
     # IEA Stocks Analysis
     if not iea_stocks_data.empty and 'value' in iea_stocks_data.columns:
         # Get latest stocks data
-        latest_stocks = iea_stocks_data.groupby('country')['value'].last()
+        latest_stocks = iea_stocks_data.groupby('country', observed=True)['value'].last()
         if not latest_stocks.empty:
             total_stocks = latest_stocks.sum()
             
@@ -575,7 +575,7 @@ def detect_energy_signals(iea_stocks_data, oil_imports_data, import_price_data):
     
     # Oil Import Price Analysis
     if not import_price_data.empty and 'value' in import_price_data.columns:
-        latest_prices = import_price_data.groupby('region')['value'].last()
+        latest_prices = import_price_data.groupby('region', observed=True)['value'].last()
         if not latest_prices.empty:
             avg_price = latest_prices.mean()
             
@@ -598,7 +598,7 @@ def detect_energy_signals(iea_stocks_data, oil_imports_data, import_price_data):
     
     # Import Volume Analysis
     if not oil_imports_data.empty and 'value' in oil_imports_data.columns:
-        latest_imports = oil_imports_data.groupby('region')['value'].last()
+        latest_imports = oil_imports_data.groupby('region', observed=True)['value'].last()
         if not latest_imports.empty:
             total_imports = latest_imports.sum()
             
@@ -812,7 +812,7 @@ else:
 st.markdown('<div class="section-header"><h2>📅 Seasonality Patterns</h2></div>', unsafe_allow_html=True)
 if not stock_seasonality_patterns.empty:
     # 1. Order countries by total average stock (descending)
-    country_totals = stock_seasonality_patterns.groupby('country')['monthly_avg_stock'].mean().sort_values(ascending=False)
+    country_totals = stock_seasonality_patterns.groupby('country', observed=True)['monthly_avg_stock'].mean().sort_values(ascending=False)
     top_countries = country_totals.head(15).index.tolist()  # Top 15 countries for better visualization
     
     # Filter data to top countries
@@ -377,7 +377,7 @@ def detect_industry_signals(manufacturing_data, steel_data, volatility_data):
     # Manufacturing Inventory Analysis
     if not manufacturing_data.empty and 'value' in manufacturing_data.columns:
         # Get latest inventory data by category
-        latest_inventory = manufacturing_data.groupby('category')['value'].last()
+        latest_inventory = manufacturing_data.groupby('category', observed=True)['value'].last()
         
         if not latest_inventory.empty:
             # Check for inventory build-up or drawdown
@@ -403,7 +403,7 @@ def detect_industry_signals(manufacturing_data, steel_data, volatility_data):
     # Steel Production Analysis
     if not steel_data.empty and 'value' in steel_data.columns:
         # Get latest steel production by region
-        latest_steel = steel_data.groupby('region')['value'].last()
+        latest_steel = steel_data.groupby('region', observed=True)['value'].last()
         
         if not latest_steel.empty:
             total_production = latest_steel.sum()
@@ -600,7 +600,7 @@ with col1:
     if not steel_production_raw.empty:
         # Calculate relative change (percentage change from first value for each region)
         steel_relative = steel_production_raw.copy()
-        steel_relative['relative_change'] = steel_relative.groupby('region')['value'].transform(
+        steel_relative['relative_change'] = steel_relative.groupby('region', observed=True)['value'].transform(
             lambda x: ((x - x.iloc[0]) / x.iloc[0]) * 100
         )
         
@@ -810,7 +810,7 @@ if not trade_partners_top5.empty:
     
     # Create country pair labels
     partners_data = partners_data.copy()
-    partners_data['country_pair'] = partners_data['country'] + ' → ' + partners_data['partner']
+    partners_data['country_pair'] = partners_data['country'].astype(str) + ' → ' + partners_data['partner'].astype(str)
     
     # Create horizontal bar chart for top 5 trading partners
     fig_partners = px.bar(
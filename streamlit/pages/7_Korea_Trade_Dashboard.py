@@ -813,7 +813,7 @@ with col2:
 # Value Index Volatility
 if not value_index_volatility.empty:
     # Aggregate by item_en, take the max volatility for each item
-    volatility_agg = value_index_volatility.groupby('item_en', as_index=False)['value'].max()
+    volatility_agg = value_index_volatility.groupby('item_en', as_index=False, observed=True)['value'].max()
     volatility_sorted = volatility_agg.sort_values('value', ascending=False).head(10)
     volatility_sorted = volatility_sorted.iloc[::-1]
     volatility_sorted = volatility_sorted.copy()
@@ -927,7 +927,7 @@ with st.container():
             ]
             wsts_yoy_monthly_grouped = (
                 wsts_yoy_monthly_filtered
-                .groupby('country', as_index=False)['yoy_change']
+                .groupby('country', as_index=False, observed=True)['yoy_change']
                 .mean()
             )
             wsts_yoy_monthly_grouped = wsts_yoy_monthly_grouped.sort_values('yoy_change', ascending=False).head(10)
@@ -963,7 +963,7 @@ with st.container():
             ]
             wsts_yoy_annual_grouped = (
                 wsts_yoy_annual_filtered
-                .groupby('country', as_index=False)['yoy_change']
+                .groupby('country', as_index=False, observed=True)['yoy_change']
                 .mean()
             )
             wsts_yoy_annual_grouped = wsts_yoy_annual_grouped.sort_values('yoy_change', ascending=False).head(10)
@@ -2,14 +2,28 @@
 import pandas as pd
 import json
 import os
+import sys
 from functools import lru_cache
 
+# Repo root, for the processed-layer schema
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.processed.schema import DIMENSIONS
+
 BASE_PATH = "eda/outputs"
 
+def apply_dtypes(df):
+    """Dimension columns -> category, other text -> string[pyarrow]; numerics stay NumPy for the charts."""
+    for col in df.columns:
+        if col in DIMENSIONS:
+            df[col] = df[col].astype("category")
+        elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(pd.StringDtype("pyarrow"))
+    return df
+
 def load_csv(sector, filename, **kwargs):
     path = os.path.join(BASE_PATH, sector, filename)
     try:
-        return pd.read_csv(path, **kwargs)
+        return apply_dtypes(pd.read_csv(path, **kwargs))
     except FileNotFoundError:
         print(f"Warning: {path} not found. Returning empty DataFrame.")
         return pd.DataFrame()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Collectors and utils are imported as ``src.<package>`` from the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,104 @@
+"""Resume test for the IEA browser pool (src/energy/globalengergydata.py).
+
+Serves tests/fixtures/iea as a static site, kills a 2-browser run once a few
+countries are checkpointed, then checks that the rerun only fetches the
+countries that were not finished.
+"""
+import functools
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("selenium")
+if not any(shutil.which(name) for name in ("google-chrome", "chromium", "chromium-browser", "chrome")):
+    pytest.skip("needs a local Chrome/Chromium", allow_module_level=True)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(REPO_ROOT, "tests", "fixtures", "iea")
+COUNTRIES = {"france", "germany", "italy", "spain", "poland", "norway"}
+# Slow country pages down so the kill lands while the pool is still working
+PAGE_DELAY = 1.0
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Static handler that records the country pages it serves."""
+
+    requested = []
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "countries":
+            self.requested.append(parts[1])
+            time.sleep(PAGE_DELAY)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_site():
+    FixtureHandler.requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(FixtureHandler, directory=FIXTURE_DIR))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def start_run(base_url, data_dir):
+    env = {**os.environ, "DATA_DIR": str(data_dir)}
+    return subprocess.Popen(
+        [sys.executable, "-m", "src.energy.globalengergydata", "--workers", "2", "--base-url", base_url],
+        cwd=REPO_ROOT, env=env, start_new_session=True,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+
+
+def checkpointed(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {urlparse(json.loads(line)["url"]).path.rsplit("/", 1)[-1] for line in f if line.strip()}
+
+
+def test_killed_run_resumes_from_checkpoint(fixture_site, tmp_path):
+    checkpoint = tmp_path / ".state" / "iea_country_checkpoint.jsonl"
+
+    # First run: kill the whole process group (browsers included) after two countries
+    proc = start_run(fixture_site, tmp_path)
+    deadline = time.monotonic() + 120
+    while len(checkpointed(checkpoint)) < 2:
+        assert proc.poll() is None, proc.stdout.read().decode()
+        assert time.monotonic() < deadline, "no countries checkpointed"
+        time.sleep(0.1)
+    os.killpg(proc.pid, signal.SIGKILL)
+    proc.wait()
+
+    finished = checkpointed(checkpoint)
+    assert 2 <= len(finished) < len(COUNTRIES)
+
+    # Second run: only the unfinished countries are fetched again
+    FixtureHandler.requested = []
+    proc = start_run(fixture_site, tmp_path)
+    output, _ = proc.communicate(timeout=300)
+    assert proc.returncode == 0, output.decode()
+
+    assert set(FixtureHandler.requested) == COUNTRIES - finished
+    assert f"{len(finished)} already checkpointed" in output.decode()
+    assert not checkpoint.exists()
+
+    df = pd.read_csv(tmp_path / "energy" / "global_energy_data.csv", encoding="utf-8-sig")
+    assert set(df["Country"].str.lower()) == COUNTRIES
+    assert df["Electricity Wind"].notna().all()
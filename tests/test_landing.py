@@ -0,0 +1,46 @@
+"""Round trips through the raw landing zone (src/utils/landing.py)."""
+import pandas as pd
+import pytest
+
+from src.utils import landing
+
+
+@pytest.fixture
+def raw_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(landing, "RAW_DIR", str(tmp_path / "raw"))
+    return tmp_path
+
+
+def test_page_writer_unions_uneven_pages(raw_dir):
+    csv_path = raw_dir / "defence" / "bid_info.csv"
+    writer = landing.PageWriter(str(csv_path))
+    writer.write([{"a": "1", "b": "2"}, {"a": "2", "b": " "}])
+    writer.write([{"a": "3", "late": "x"}])
+    path = writer.close()
+
+    df = pd.read_parquet(path)
+    assert list(df.columns) == ["a", "b", "late"]
+    assert df["a"].tolist() == [1, 2, 3]
+    assert df["b"].dtype == "float64" and df["b"].isna().tolist() == [False, True, True]
+    assert df["late"].isna().tolist() == [True, True, False]
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path, encoding="utf-8-sig"), df, check_dtype=False)
+
+
+def test_write_raw_matches_csv_mirror(raw_dir):
+    csv_path = raw_dir / "trade" / "kotra.csv"
+    df = pd.DataFrame({
+        "DATA_VALUE": ["1", "", "3"],
+        "ITEM_CODE": ["0001", "0002", ""],
+        "FLAG": ["True", "False", "True"],
+        "GAPPY_FLAG": ["True", None, "False"],
+        "NAME": ["Oil", "Net Exporter", "Gas"],
+        "COUNT": [1, 2, 3],
+    })
+    landing.write_raw(df, str(csv_path))
+
+    from_parquet = landing.read_latest(str(csv_path))
+    from_csv = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"ITEM_CODE": str})
+    assert from_parquet["DATA_VALUE"].dropna().tolist() == [1.0, 3.0]
+    assert from_parquet["FLAG"].dtype == bool
+    pd.testing.assert_frame_equal(from_parquet.astype(object).where(from_parquet.notna(), None),
+                                  from_csv.astype(object).where(from_csv.notna(), None))
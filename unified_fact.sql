@@ -0,0 +1,32 @@
+-- Materialized, indexed copy of unified_macro_view (unified_view.sql).
+-- The casts and CONCATs of the ~30 UNION ALL branches run once per refresh
+-- instead of on every query. upload_postgres.py refreshes it after each upload.
+--
+-- Apply once, after unified_view.sql and after the first upload has created
+-- the *_processed tables both views read:
+--   python upload_postgres.py
+--   psql -d macrodb -f unified_view.sql -f unified_fact.sql
+-- Column changes to those tables need both views dropped first
+-- (DROP MATERIALIZED VIEW unified_macro_fact; DROP VIEW unified_macro_view),
+-- then the upload, then this pair again; see README and migrate_date_timestamp.sql.
+DROP MATERIALIZED VIEW IF EXISTS unified_macro_fact;
+
+CREATE MATERIALIZED VIEW unified_macro_fact AS
+SELECT
+  -- Stable row key within a source file; REFRESH ... CONCURRENTLY diffs on it
+  row_number() OVER (
+    PARTITION BY file_source
+    ORDER BY date, country, indicator, partner, period, period_type, unit, source, value, frequency, insight
+  ) AS fact_id,
+  *
+FROM unified_macro_view;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX unified_macro_fact_row_key ON unified_macro_fact (file_source, fact_id);
+
+-- Cross-sector lookups: one indicator over time, one country over time, one domain (EDA)
+CREATE INDEX unified_macro_fact_sector_indicator_date ON unified_macro_fact (sector, indicator, date);
+CREATE INDEX unified_macro_fact_country_date ON unified_macro_fact (country, date);
+CREATE INDEX unified_macro_fact_domain_date ON unified_macro_fact (domain, date);
+
+ANALYZE unified_macro_fact;
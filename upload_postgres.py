@@ -1,9 +1,17 @@
+import argparse
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 from sqlalchemy import create_engine
 from pathlib import Path
 from dotenv import load_dotenv
 import os
 
+from src.processed import build_manifest, schema
+
 # Load .env credentials
 load_dotenv()
 
@@ -13,27 +21,423 @@ PG_DB = os.getenv("POSTGRES_DB", "macrodb")
 PG_HOST = "localhost"
 PG_PORT = 5432
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    f"postgresql+psycopg2://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DB}"
-)
-
 # Base directory of your processed CSV files
 base_dir = Path("data/processed")
 
-# Loop through all CSV files
-for domain_dir in base_dir.iterdir():
-    if not domain_dir.is_dir():
-        continue
-    domain = domain_dir.name
-    for file in domain_dir.glob("*.csv"):
-        table_name = f"{domain}_{file.stem}".lower().replace("-", "_")
-        print(f"🔄 Uploading: {file} → table: {table_name}")
+# Materialized unified fact table (unified_fact.sql), refreshed after every upload that changed rows
+FACT_VIEW = "unified_macro_fact"
+
+# Natural key per table for --upsert; tables without one are always replaced
+NATURAL_KEYS = {
+    "agriculture_crop_production_processed": ("date", "country", "commodity", "indicator"),
+    "economy_economy_confidence_processed": ("date", "category", "indicator"),
+    "economy_fx_rates_processed": ("date", "currency", "quote"),
+    "economy_leading_vs_coincident_kospi_processed": ("date", "indicator"),
+    "energy_iea_oil_stocks_processed": ("date", "country"),
+    "energy_oil_imports_with_continents_processed": ("date", "country", "unit"),
+    "industry_manufacture_inventory_processed": ("date", "category"),
+    "industry_steel_combined_processed": ("date", "region", "indicator"),
+    "trade_global_trade_variation_top5_processed": ("date", "country", "partner", "indicator"),
+    "trade_global_trade_processed": ("date", "country", "partner", "indicator"),
+    "trade_global_export_increase_items_top5_processed": ("date", "full_label", "indicator"),
+    "trade_global_export_decrease_items_top5_processed": ("date", "full_label", "indicator"),
+    "trade_korea_export_country_variation_processed": ("date", "partner"),
+    "trade_korea_import_country_variation_processed": ("date", "partner"),
+    "trade_korea_export_increase_items_processed": ("date", "commodity_name"),
+    "trade_korea_import_increase_items_processed": ("date", "commodity_name"),
+    "trade_korea_trade_yoy_processed": ("date", "partner", "category", "indicator"),
+    "trade_korea_trade_items_yoy_processed": ("date", "category", "indicator"),
+    "trade_shipping_indices_processed": ("date", "indicator"),
+    "trade_wsts_billings_latest_processed": ("date", "country", "period"),
+}
+
+# Top-N rankings: each refresh is the complete list for the dates it covers, so on --upsert
+# entries that dropped out of a date's ranking are deleted instead of lingering next to the new ones
+SNAPSHOT_TABLES = {
+    "trade_global_trade_variation_top5_processed",
+    "trade_global_export_increase_items_top5_processed",
+    "trade_global_export_decrease_items_top5_processed",
+    "trade_korea_export_increase_items_processed",
+    "trade_korea_import_increase_items_processed",
+}
+
+# Tables whose processed files may repeat a natural key on purpose (the last row wins);
+# anywhere else a repeated key means the key is wrong and the load fails
+DUPLICATE_KEYS_ALLOWED = set()
+
+
+def ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def pg_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def csv_buffer(df):
+    """``df`` as headerless CSV for ``COPY ... (FORMAT csv)``.
+
+    Missing values are written as unquoted empties, which COPY reads as NULL.
+    Empty strings are written the same way, so they load as NULL too: the
+    processed CSVs cannot tell the two apart anyway (both read back as NaN).
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S")
+    buffer.seek(0)
+    return buffer
+
+
+def table_columns(cursor, table_name):
+    cursor.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = %s ORDER BY ordinal_position",
+        (table_name,),
+    )
+    return cursor.fetchall()
+
+
+def dependent_views(cursor, table_name):
+    """Views and materialized views that read ``table_name`` (they block DROP TABLE and column retypes)."""
+    cursor.execute(
+        "SELECT DISTINCT v.relname FROM pg_depend d "
+        "JOIN pg_rewrite r ON r.oid = d.objid "
+        "JOIN pg_class v ON v.oid = r.ev_class "
+        "WHERE d.classid = 'pg_rewrite'::regclass AND d.refclassid = 'pg_class'::regclass "
+        "AND d.refobjid = to_regclass(%s) AND v.oid <> d.refobjid ORDER BY 1",
+        (ident(table_name),),
+    )
+    return [name for name, in cursor.fetchall()]
+
+
+# Integer types from narrowest to widest (information_schema names)
+INTEGER_TYPES = ("smallint", "integer", "bigint")
+NUMERIC_TYPES = set(INTEGER_TYPES) | {"real", "double precision", "numeric"}
+
+
+def assignable(old_type, new_type):
+    """Whether every ``new_type`` value fits an existing ``old_type`` column unchanged.
+
+    Only widening changes pass: anything into TEXT, any number into DOUBLE
+    PRECISION / NUMERIC, and an integer into an integer type at least as wide.
+    ``double precision`` into ``bigint`` would round fractions, so it fails.
+    """
+    if old_type == new_type or old_type == "text":
+        return True
+    if old_type in ("double precision", "numeric"):
+        return new_type in NUMERIC_TYPES
+    if old_type in INTEGER_TYPES and new_type in INTEGER_TYPES:
+        return INTEGER_TYPES.index(new_type) <= INTEGER_TYPES.index(old_type)
+    return False
+
+
+def drop_duplicate_keys(df, table_name, key):
+    """``df`` without repeated ``key`` rows (the last one wins) and the number dropped.
+
+    Raises unless ``table_name`` is in ``DUPLICATE_KEYS_ALLOWED``, so rows are never discarded silently.
+    """
+    duplicated = df.duplicated(subset=list(key), keep="last")
+    dropped = int(duplicated.sum())
+    if dropped and table_name not in DUPLICATE_KEYS_ALLOWED:
+        sample = df.loc[duplicated, list(key)].head(3).to_dict("records")
+        raise ValueError(f"{table_name}: {dropped} row(s) repeat the natural key {key}, e.g. {sample}")
+    return df[~duplicated], dropped
+
+
+def key_index_name(table_name):
+    return f"{table_name}_natural_key"
+
+
+def has_key_index(cursor, table_name):
+    cursor.execute(
+        "SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = %s",
+        (key_index_name(table_name),),
+    )
+    return cursor.fetchone() is not None
+
+
+def create_key_index(cursor, table_name, key):
+    # NULLS NOT DISTINCT (PostgreSQL 15+) so keys with a missing partner/commodity still conflict
+    cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {ident(key_index_name(table_name))} "
+                   f"ON {ident(table_name)} ({', '.join(ident(col) for col in key)}) NULLS NOT DISTINCT")
+
+
+def upsert(cursor, table_name, staging, columns, key, snapshot=False):
+    """Merge ``staging`` into ``table_name`` on ``key``; returns ``(inserted, updated, deleted)``.
+
+    Needs the unique index from ``create_key_index``. Rows whose non-key
+    values are unchanged are left untouched (no new tuple, no index churn);
+    ``xmax = 0`` tells fresh inserts apart from updates. With ``snapshot``,
+    target rows for a ``date`` present in staging whose key is not in staging
+    are deleted first, so a reshuffled ranking replaces the old one.
+    """
+    values = [col for col in columns if col not in key]
+    key_list = ", ".join(ident(col) for col in key)
+    column_list = ", ".join(ident(col) for col in columns)
+    target = ident(table_name)
+
+    deleted = 0
+    if snapshot:
+        cursor.execute(
+            f"DELETE FROM {target} t WHERE t.date IN (SELECT date FROM {ident(staging)}) "
+            f"AND NOT EXISTS (SELECT 1 FROM {ident(staging)} s WHERE "
+            f"({', '.join(f's.{ident(col)}' for col in key)}) IS NOT DISTINCT FROM "
+            f"({', '.join(f't.{ident(col)}' for col in key)}))"
+        )
+        deleted = cursor.rowcount
+
+    if values:
+        on_conflict = (
+            "DO UPDATE SET " + ", ".join(f"{ident(col)} = EXCLUDED.{ident(col)}" for col in values)
+            + f" WHERE ({', '.join(f'{target}.{ident(col)}' for col in values)})"
+            + f" IS DISTINCT FROM ({', '.join(f'EXCLUDED.{ident(col)}' for col in values)})"
+        )
+    else:
+        on_conflict = "DO NOTHING"
+    cursor.execute(
+        f"WITH merged AS ("
+        f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {ident(staging)} "
+        f"ON CONFLICT ({key_list}) {on_conflict} RETURNING (xmax = 0) AS inserted) "
+        f"SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged"
+    )
+    inserted, updated = cursor.fetchone()
+    return inserted, updated, deleted
+
+
+def load_table(engine, df, table_name, key=None):
+    """Bulk-load ``df`` as ``table_name``: COPY into an unlogged staging table, then swap or merge it in.
+
+    Everything runs in one transaction, so readers see either the previous
+    table or the complete new one. With a natural ``key`` and unchanged
+    columns the staging rows are upserted; otherwise, when the columns are
+    unchanged the target is refilled in place (TRUNCATE + INSERT), which keeps
+    its indexes, grants and the views built on it, and if they changed the
+    staging table replaces it. Returns ``{"inserted", "updated", "deleted", "unchanged"}``
+    or ``{"replaced"}`` row counts, plus ``{"duplicates dropped"}`` when rows
+    repeating the key were discarded (only allowed for ``DUPLICATE_KEYS_ALLOWED``).
+
+    A table without the natural-key index yet (first upsert, or loaded in
+    replace mode and possibly holding repeated keys) is refilled in place from
+    the deduplicated staging rows and then indexed, instead of merged.
+
+    A table that views depend on (unified_macro_view / unified_macro_fact)
+    cannot be dropped. If only column types changed and the new values fit the
+    old columns, it is refilled in place with its old types (see
+    migrate_date_timestamp.sql for the TEXT -> TIMESTAMP date change);
+    otherwise the load fails and names the views to drop first.
+    """
+    dropped = 0
+    if key:
+        df, dropped = drop_duplicate_keys(df, table_name, key)
+    staging = f"{table_name}__staging"
+    columns = ", ".join(ident(col) for col in df.columns)
+    definition = ", ".join(f"{ident(col)} {pg_type(dtype)}" for col, dtype in df.dtypes.items())
+
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {ident(staging)}")
+            cursor.execute(f"CREATE UNLOGGED TABLE {ident(staging)} ({definition})")
+            cursor.copy_expert(f"COPY {ident(staging)} ({columns}) FROM STDIN WITH (FORMAT csv)", csv_buffer(df))
+
+            existing, incoming = table_columns(cursor, table_name), table_columns(cursor, staging)
+            same_columns = existing == incoming
+            if existing and not same_columns:
+                views = dependent_views(cursor, table_name)
+                same_names = [c for c, _ in existing] == [c for c, _ in incoming]
+                if views and not same_names:
+                    raise RuntimeError(
+                        f"{table_name} has new columns but is used by {', '.join(views)}; "
+                        f"drop them, upload, then re-apply unified_view.sql and unified_fact.sql"
+                    )
+                if views:
+                    retyped = [(col, old, new) for (col, old), (_, new) in zip(existing, incoming) if old != new]
+                    blocked = [f"{col} {old} -> {new}" for col, old, new in retyped if not assignable(old, new)]
+                    if blocked:
+                        raise RuntimeError(
+                            f"{table_name}: cannot retype {', '.join(blocked)} while it is used by {', '.join(views)}; "
+                            f"migrate the column first (see migrate_date_timestamp.sql)"
+                        )
+                    print(f"⚠️ {table_name}: keeping {', '.join(f'{c} {o}' for c, o, _ in retyped)} "
+                          f"(used by {', '.join(views)}); run migrate_date_timestamp.sql to retype")
+                    # Refill rather than merge: the old TEXT keys would not match the new values' text form
+                    same_columns, key = True, None
+            if key and same_columns and not has_key_index(cursor, table_name):
+                cursor.execute(f"TRUNCATE {ident(table_name)}")
+                cursor.execute(f"INSERT INTO {ident(table_name)} ({columns}) SELECT {columns} FROM {ident(staging)}")
+                cursor.execute(f"DROP TABLE {ident(staging)}")
+                create_key_index(cursor, table_name, key)
+                counts = {"replaced": len(df)}
+            elif key and same_columns:
+                inserted, updated, deleted = upsert(cursor, table_name, staging, list(df.columns), key,
+                                                    snapshot=table_name in SNAPSHOT_TABLES)
+                cursor.execute(f"DROP TABLE {ident(staging)}")
+                counts = {"inserted": inserted, "updated": updated, "deleted": deleted,
+                          "unchanged": len(df) - inserted - updated}
+            elif same_columns:
+                cursor.execute(f"TRUNCATE {ident(table_name)}")
+                cursor.execute(f"INSERT INTO {ident(table_name)} ({columns}) SELECT {columns} FROM {ident(staging)}")
+                cursor.execute(f"DROP TABLE {ident(staging)}")
+                counts = {"replaced": len(df)}
+            else:
+                cursor.execute(f"ALTER TABLE {ident(staging)} SET LOGGED")
+                cursor.execute(f"DROP TABLE IF EXISTS {ident(table_name)}")
+                cursor.execute(f"ALTER TABLE {ident(staging)} RENAME TO {ident(table_name)}")
+                if key:
+                    create_key_index(cursor, table_name, key)
+                counts = {"replaced": len(df)}
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    if dropped:
+        counts["duplicates dropped"] = dropped
+    return counts
+
+
+def make_engine(pool_size=1):
+    # pool_pre_ping drops connections the server closed between runs
+    return create_engine(
+        f"postgresql+psycopg2://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DB}",
+        pool_size=pool_size, max_overflow=0, pool_pre_ping=True,
+    )
+
+
+def refresh_fact_view(engine, name=FACT_VIEW):
+    """Refresh the materialized fact table; returns False when it is not installed.
+
+    Once populated it is refreshed CONCURRENTLY (diffed on its unique row
+    key), so dashboard and EDA queries keep reading the previous contents
+    instead of waiting on the refresh.
+    """
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT ispopulated FROM pg_matviews WHERE schemaname = current_schema() AND matviewname = %s",
+                (name,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return False
+            concurrently = "CONCURRENTLY " if row[0] else ""
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {concurrently}{ident(name)}")
+            cursor.execute(f"ANALYZE {ident(name)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return True
+
+
+def build_jobs(everything=False):
+    """Processed files to load as ``(table_name, domain, file)``.
+
+    Files the ETL manifest marks clean (loaded since their last rebuild) are
+    skipped unless ``everything``; files the manifest does not track are always loaded.
+    """
+    clean = set() if everything else set(build_manifest.clean_outputs())
+    jobs = []
+    for domain_dir in sorted(base_dir.iterdir()):
+        if not domain_dir.is_dir():
+            continue
+        domain = domain_dir.name
+        for file in sorted(domain_dir.glob("*.csv")):
+            if os.path.abspath(file) in clean:
+                continue
+            jobs.append((f"{domain}_{file.stem}".lower().replace("-", "_"), domain, file))
+    return jobs
+
+
+def upload_one(engine, table_name, domain, file, upsert_mode=False):
+    """Read and load one file; returns ``(table_name, status, seconds, detail)`` instead of raising."""
+    started = time.perf_counter()
+    print(f"🔄 Uploading: {file} → table: {table_name}")
+    try:
+        df = schema.read(str(file))
+        df["domain"] = pd.Categorical([domain] * len(df))
+        df["file_source"] = pd.Categorical([file.stem] * len(df))
+        key = NATURAL_KEYS.get(table_name) if upsert_mode else None
+        counts = load_table(engine, df, table_name, key)
+        detail = ", ".join(f"{n} {k}" for k, n in counts.items())
+        print(f"✅ Done: {table_name} ({detail})")
+        changed = sum(counts.get(k, 0) for k in ("replaced", "inserted", "updated", "deleted"))
+        return table_name, "ok" if changed else "unchanged", time.perf_counter() - started, detail
+    except Exception as e:
+        print(f"❌ Failed on {file}: {e}")
+        return table_name, "failed", time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+def upload_all(work, jobs=1, upsert_mode=False):
+    """Upload ``work`` (from ``build_jobs``), ``jobs`` tables at a time, each on its own pooled connection."""
+    # One connection per worker
+    engine = make_engine(pool_size=jobs)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(upload_one, engine, *job, upsert_mode=upsert_mode) for job in work]
+            return [future.result() for future in as_completed(futures)]
+    finally:
+        engine.dispose()
+
+
+def print_report(results, wall_seconds):
+    print("\n=== UPLOAD SUMMARY ===")
+    print(f"{'table':<50} {'status':<10} {'secs':>7}  detail")
+    for table_name, status, seconds, detail in sorted(results, key=lambda r: -r[2]):
+        print(f"{table_name:<50} {status:<10} {seconds:>7.2f}  {detail}")
+    failed = sum(status == "failed" for _, status, _, _ in results)
+    slowest = max((seconds for _, _, seconds, _ in results), default=0.0)
+    unchanged = sum(status == "unchanged" for _, status, _, _ in results)
+    print(f"\n{len(results) - failed - unchanged} loaded, {unchanged} unchanged, {failed} failed, "
+          f"wall time {wall_seconds:.1f}s (slowest table {slowest:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load data/processed into PostgreSQL")
+    parser.add_argument("--upsert", action="store_true",
+                        help="merge tables with a natural key instead of replacing them")
+    parser.add_argument("--jobs", type=int, default=1, help="tables to upload in parallel (0 = one per CPU)")
+    parser.add_argument("--no-refresh", action="store_true", help=f"do not refresh {FACT_VIEW} afterwards")
+    parser.add_argument("--all", action="store_true", help="also load files already loaded since their last rebuild")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    work = build_jobs(everything=args.all)
+    print(f"📦 {len(work)} processed file(s) to load")
+    results = upload_all(work, jobs=args.jobs or os.cpu_count(), upsert_mode=args.upsert)
+
+    # Loaded files stop being dirty in the ETL manifest; failed ones are retried next run
+    files = {table_name: file for table_name, _, file in work}
+    loaded = [files[table_name] for table_name, status, _, _ in results if status != "failed"]
+    if loaded:
+        build_manifest.mark_clean(loaded)
+
+    if not args.no_refresh and any(status == "ok" for _, status, _, _ in results):
+        refresh_started = time.perf_counter()
+        engine = make_engine()
         try:
-            df = pd.read_csv(file)
-            df["domain"] = domain
-            df["file_source"] = file.stem
-            df.to_sql(table_name, engine, if_exists="replace", index=False)
-            print(f"✅ Done: {table_name}")
+            if refresh_fact_view(engine):
+                print(f"🔁 Refreshed {FACT_VIEW} in {time.perf_counter() - refresh_started:.1f}s")
+            else:
+                print(f"⚠️ {FACT_VIEW} not found; apply unified_fact.sql to create it")
         except Exception as e:
-            print(f"❌ Failed on {file}: {e}")
+            print(f"❌ Refresh of {FACT_VIEW} failed: {e}")
+            results.append((FACT_VIEW, "failed", time.perf_counter() - refresh_started, f"{type(e).__name__}: {e}"))
+        finally:
+            engine.dispose()
+
+    print_report(results, time.perf_counter() - started)
+
+    if any(status == "failed" for _, status, _, _ in results):
+        sys.exit(1)